@@ -3,6 +3,34 @@
 Handles world-space camera positioning, zoom, panning, and view transforms.
 """
 
+from typing import NamedTuple
+
+import numpy as np
+
+# Zoom limits
+_MIN_ZOOM = 1.0
+_MAX_ZOOM = 10.0
+
+# Zoom speed (multiplier per second when holding trigger)
+_ZOOM_SPEED = 2.0
+
+# Pan speed (world pixels per second at zoom=1.0)
+_PAN_SPEED = 300.0
+
+# Nudge margin (screen fraction from edge to start nudging)
+_NUDGE_MARGIN = 0.15
+
+# Nudge speed (fraction of distance to move per second)
+_NUDGE_SPEED = 5.0
+
+
+class ViewTransform(NamedTuple):
+    """Render transform: screen position of the world origin, plus zoom."""
+
+    offset_x: float
+    offset_y: float
+    zoom: float
+
 
 class Camera:
     """Manages camera state and world-to-screen transforms.
@@ -16,21 +44,33 @@ class Camera:
         zoom: Current zoom level (1.0 = 1 world pixel = 1 screen pixel).
     """
 
-    # Zoom limits
-    MIN_ZOOM = 1.0
-    MAX_ZOOM = 10.0
-
-    # Zoom speed (multiplier per second when holding trigger)
-    ZOOM_SPEED = 2.0
-
-    # Pan speed (world pixels per second at zoom=1.0)
-    PAN_SPEED = 300.0
-
-    # Nudge margin (screen fraction from edge to start nudging)
-    NUDGE_MARGIN = 0.15
-
-    # Nudge speed (fraction of distance to move per second)
-    NUDGE_SPEED = 5.0
+    __slots__ = (
+        "world_width",
+        "world_height",
+        "screen_width",
+        "screen_height",
+        "_cam_x",
+        "_cam_y",
+        "_zoom",
+        "_half_sw",
+        "_half_sh",
+        "_inv_zoom",
+        "_half_view_w",
+        "_half_view_h",
+        "_pan_bounds_x",
+        "_pan_bounds_y",
+        "_view_mat",
+        "_view_transform",
+        "_view_dirty",
+    )
+
+    # Public aliases of the module-level tuning constants
+    MIN_ZOOM = _MIN_ZOOM
+    MAX_ZOOM = _MAX_ZOOM
+    ZOOM_SPEED = _ZOOM_SPEED
+    PAN_SPEED = _PAN_SPEED
+    NUDGE_MARGIN = _NUDGE_MARGIN
+    NUDGE_SPEED = _NUDGE_SPEED
 
     def __init__(
         self,
@@ -52,6 +92,10 @@ class Camera:
         self.screen_width = screen_width
         self.screen_height = screen_height
 
+        # Screen center is fixed for the camera's lifetime
+        self._half_sw = screen_width / 2.0
+        self._half_sh = screen_height / 2.0
+
         # Start centered on the world
         self.cam_x = world_width / 2.0
         self.cam_y = world_height / 2.0
@@ -61,12 +105,96 @@ class Camera:
         available_w = screen_width - padding * 2
         available_h = screen_height - padding * 2
         fit_zoom = min(available_w / world_width, available_h / world_height)
-        self.zoom = max(self.MIN_ZOOM, min(fit_zoom, self.MAX_ZOOM))
+        self.zoom = min(_MAX_ZOOM, max(_MIN_ZOOM, fit_zoom))
+
+    @property
+    def cam_x(self) -> float:
+        """X position of camera center in world coordinates."""
+        return self._cam_x
+
+    @cam_x.setter
+    def cam_x(self, value: float) -> None:
+        self._cam_x = value
+        self._view_dirty = True
+
+    @property
+    def cam_y(self) -> float:
+        """Y position of camera center in world coordinates."""
+        return self._cam_y
+
+    @cam_y.setter
+    def cam_y(self, value: float) -> None:
+        self._cam_y = value
+        self._view_dirty = True
+
+    @property
+    def zoom(self) -> float:
+        """Current zoom level (1.0 = 1 world pixel = 1 screen pixel)."""
+        return self._zoom
+
+    @zoom.setter
+    def zoom(self, value: float) -> None:
+        self._zoom = value
+        self._on_zoom_changed()
+
+    def _on_zoom_changed(self) -> None:
+        """Recompute cached values that depend on zoom."""
+        self._inv_zoom = 1.0 / self._zoom
+        self._half_view_w = self._half_sw * self._inv_zoom
+        self._half_view_h = self._half_sh * self._inv_zoom
+        self._view_dirty = True
+
+        # Pan clamp bounds (with some margin to see edges); None on an axis
+        # where the world is smaller than the view, which pins it to center
+        min_x = self._half_view_w * 0.5
+        max_x = self.world_width - min_x
+        min_y = self._half_view_h * 0.5
+        max_y = self.world_height - min_y
+        self._pan_bounds_x = (min_x, max_x) if max_x > min_x else None
+        self._pan_bounds_y = (min_y, max_y) if max_y > min_y else None
+
+    def _recalculate(self) -> None:
+        """Rebuild the cached view transform and 2x3 affine matrix."""
+        z = self._zoom
+        offset_x = self._half_sw - self._cam_x * z
+        offset_y = self._half_sh - self._cam_y * z
+        self._view_transform = ViewTransform(offset_x, offset_y, z)
+        self._view_mat = np.array(
+            [[z, 0.0, offset_x], [0.0, z, offset_y]],
+            dtype=np.float32,
+        )
+        self._view_dirty = False
+
+    def get_view_matrix(self) -> np.ndarray:
+        """Get the world-to-screen transform as a 2x3 affine matrix.
+
+        The matrix is only rebuilt when the camera position or zoom has
+        changed since the last call.
+
+        Returns:
+            float32 array M such that screen = M @ (world_x, world_y, 1).
+        """
+        if self._view_dirty:
+            self._recalculate()
+        return self._view_mat
+
+    def apply_view_matrix(self, points: np.ndarray) -> np.ndarray:
+        """Transform an array of world points with the cached view matrix.
+
+        Args:
+            points: (N, 2) array of (world_x, world_y) positions.
+
+        Returns:
+            (N, 2) array of (screen_x, screen_y) positions.
+        """
+        mat = self.get_view_matrix()
+        return points @ mat[:, :2].T + mat[:, 2]
 
     def update_zoom(self, rt: float, lt: float, dt_sec: float) -> bool:
         """Update zoom based on trigger input.
 
-        RT zooms in, LT zooms out (continuous while held).
+        RT zooms in, LT zooms out (continuous while held). If both are held,
+        the net trigger value (rt - lt) applies.
 
         Args:
             rt: Right trigger value (0 to 1).
@@ -79,16 +207,21 @@ class Camera:
         if rt <= 0 and lt <= 0:
             return False
 
-        old_zoom = self.zoom
+        old_zoom = self._zoom
 
-        # RT zooms in (multiply), LT zooms out (divide)
-        if rt > 0:
-            self.zoom *= 1.0 + self.ZOOM_SPEED * rt * dt_sec
-        if lt > 0:
-            self.zoom /= 1.0 + self.ZOOM_SPEED * lt * dt_sec
+        # RT zooms in (multiply), LT zooms out (divide); holding both nets out
+        delta = _ZOOM_SPEED * (rt - lt) * dt_sec
+        if delta >= 0:
+            zoom = old_zoom * (1.0 + delta)
+        else:
+            zoom = old_zoom / (1.0 - delta)
 
-        # Clamp zoom
-        self.zoom = max(self.MIN_ZOOM, min(self.zoom, self.MAX_ZOOM))
+        # Clamp zoom, then assign once so caches refresh a single time
+        if zoom < _MIN_ZOOM:
+            zoom = _MIN_ZOOM
+        elif zoom > _MAX_ZOOM:
+            zoom = _MAX_ZOOM
+        self.zoom = zoom
 
         return abs(self.zoom - old_zoom) > 0.001
 
@@ -109,28 +242,21 @@ class Camera:
             return False
 
         # Scale pan speed inversely with zoom (so screen movement feels consistent)
-        speed = self.PAN_SPEED / self.zoom
+        speed = _PAN_SPEED * self._inv_zoom
 
         self.cam_x += stick_x * speed * dt_sec
         self.cam_y += stick_y * speed * dt_sec
 
-        # Clamp to world bounds (with some margin to see edges)
-        half_view_w = (self.screen_width / 2) / self.zoom
-        half_view_h = (self.screen_height / 2) / self.zoom
-
-        min_x = half_view_w * 0.5
-        max_x = self.world_width - half_view_w * 0.5
-        min_y = half_view_h * 0.5
-        max_y = self.world_height - half_view_h * 0.5
-
-        # Only clamp if world is larger than view
-        if max_x > min_x:
-            self.cam_x = max(min_x, min(self.cam_x, max_x))
+        # Clamp to world bounds (precomputed per zoom level)
+        bounds_x = self._pan_bounds_x
+        if bounds_x is not None:
+            self.cam_x = min(max(self.cam_x, bounds_x[0]), bounds_x[1])
         else:
             self.cam_x = self.world_width / 2
 
-        if max_y > min_y:
-            self.cam_y = max(min_y, min(self.cam_y, max_y))
+        bounds_y = self._pan_bounds_y
+        if bounds_y is not None:
+            self.cam_y = min(max(self.cam_y, bounds_y[0]), bounds_y[1])
         else:
             self.cam_y = self.world_height / 2
 
@@ -162,41 +288,33 @@ class Camera:
         Returns:
             True if camera moved.
         """
-        # Convert world point to screen position
-        screen_x, screen_y = self.world_to_screen(world_x, world_y)
+        # Convert world point to screen position (inlined world_to_screen)
+        screen_x = (world_x - self._cam_x) * self._zoom + self._half_sw
+        screen_y = (world_y - self._cam_y) * self._zoom + self._half_sh
 
         # Calculate comfortable bounds (with margin)
-        margin_x = self.screen_width * self.NUDGE_MARGIN
-        margin_y = self.screen_height * self.NUDGE_MARGIN
+        margin_x = self.screen_width * _NUDGE_MARGIN
+        margin_y = self.screen_height * _NUDGE_MARGIN
 
         min_x = margin_x
         max_x = self.screen_width - margin_x
         min_y = margin_y
         max_y = self.screen_height - margin_y
 
-        # Calculate how far outside comfortable bounds
-        nudge_x = 0.0
-        nudge_y = 0.0
-
-        if screen_x < min_x:
-            nudge_x = screen_x - min_x
-        elif screen_x > max_x:
-            nudge_x = screen_x - max_x
-
-        if screen_y < min_y:
-            nudge_y = screen_y - min_y
-        elif screen_y > max_y:
-            nudge_y = screen_y - max_y
+        # How far outside comfortable bounds (at most one term is nonzero
+        # per axis since min < max)
+        nudge_x = min(screen_x - min_x, 0.0) + max(screen_x - max_x, 0.0)
+        nudge_y = min(screen_y - min_y, 0.0) + max(screen_y - max_y, 0.0)
 
         if abs(nudge_x) < 1 and abs(nudge_y) < 1:
             return False
 
         # Convert screen offset to world offset and apply smoothly
-        world_nudge_x = nudge_x / self.zoom
-        world_nudge_y = nudge_y / self.zoom
+        world_nudge_x = nudge_x * self._inv_zoom
+        world_nudge_y = nudge_y * self._inv_zoom
 
         # Smooth movement
-        factor = min(1.0, self.NUDGE_SPEED * dt_sec)
+        factor = min(1.0, _NUDGE_SPEED * dt_sec)
         self.cam_x += world_nudge_x * factor
         self.cam_y += world_nudge_y * factor
 
@@ -213,10 +331,32 @@ class Camera:
             (screen_x, screen_y) tuple.
         """
         # Offset from camera center, scaled by zoom, centered on screen
-        screen_x = (world_x - self.cam_x) * self.zoom + self.screen_width / 2
-        screen_y = (world_y - self.cam_y) * self.zoom + self.screen_height / 2
+        screen_x = (world_x - self._cam_x) * self._zoom + self._half_sw
+        screen_y = (world_y - self._cam_y) * self._zoom + self._half_sh
         return (screen_x, screen_y)
 
+    def world_to_screen_x(self, world_x: float) -> float:
+        """Convert a world X coordinate to screen X.
+
+        Args:
+            world_x: X position in world space.
+
+        Returns:
+            Screen X position.
+        """
+        return (world_x - self._cam_x) * self._zoom + self._half_sw
+
+    def world_to_screen_y(self, world_y: float) -> float:
+        """Convert a world Y coordinate to screen Y.
+
+        Args:
+            world_y: Y position in world space.
+
+        Returns:
+            Screen Y position.
+        """
+        return (world_y - self._cam_y) * self._zoom + self._half_sh
+
     def screen_to_world(self, screen_x: float, screen_y: float) -> tuple[float, float]:
         """Convert screen coordinates to world coordinates.
 
@@ -227,31 +367,80 @@ class Camera:
         Returns:
             (world_x, world_y) tuple.
         """
-        world_x = (screen_x - self.screen_width / 2) / self.zoom + self.cam_x
-        world_y = (screen_y - self.screen_height / 2) / self.zoom + self.cam_y
+        world_x = (screen_x - self._half_sw) * self._inv_zoom + self._cam_x
+        world_y = (screen_y - self._half_sh) * self._inv_zoom + self._cam_y
         return (world_x, world_y)
 
+    def world_to_screen_batch(
+        self, points: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Convert an array of world points to screen coordinates.
+
+        Args:
+            points: (N, 2) array of (world_x, world_y) positions.
+            out: Optional preallocated (N, 2) array to write into.
+
+        Returns:
+            (N, 2) array of (screen_x, screen_y) positions.
+        """
+        # Integer input can't hold the scaled result, so promote it to float
+        points = np.asarray(points)
+        if points.dtype.kind != "f":
+            points = points.astype(np.float64)
+        cam = np.array([self._cam_x, self._cam_y], dtype=points.dtype)
+        half = np.array([self._half_sw, self._half_sh], dtype=points.dtype)
+        out = np.subtract(points, cam, out=out)
+        out *= self._zoom
+        out += half
+        return out
+
+    def screen_to_world_batch(
+        self, points: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Convert an array of screen points to world coordinates.
+
+        Args:
+            points: (N, 2) array of (screen_x, screen_y) positions.
+            out: Optional preallocated (N, 2) array to write into.
+
+        Returns:
+            (N, 2) array of (world_x, world_y) positions.
+        """
+        # Integer input can't hold the scaled result, so promote it to float
+        points = np.asarray(points)
+        if points.dtype.kind != "f":
+            points = points.astype(np.float64)
+        cam = np.array([self._cam_x, self._cam_y], dtype=points.dtype)
+        half = np.array([self._half_sw, self._half_sh], dtype=points.dtype)
+        out = np.subtract(points, half, out=out)
+        out *= self._inv_zoom
+        out += cam
+        return out
+
     def get_visible_world_rect(self) -> tuple[float, float, float, float]:
         """Get the world-space rectangle visible on screen.
 
         Returns:
             (x, y, width, height) in world coordinates.
         """
-        half_w = (self.screen_width / 2) / self.zoom
-        half_h = (self.screen_height / 2) / self.zoom
+        half_w = self._half_view_w
+        half_h = self._half_view_h
         return (
-            self.cam_x - half_w,
-            self.cam_y - half_h,
+            self._cam_x - half_w,
+            self._cam_y - half_h,
             half_w * 2,
             half_h * 2,
         )
 
-    def get_view_transform(self) -> tuple[float, float, float]:
+    def get_view_transform(self) -> ViewTransform:
         """Get transform parameters for rendering.
 
+        The same instance is returned until the camera moves or zooms.
+
         Returns:
             (offset_x, offset_y, zoom) where offset is screen position
             of world origin (0, 0).
         """
-        origin_screen_x, origin_screen_y = self.world_to_screen(0, 0)
-        return (origin_screen_x, origin_screen_y, self.zoom)
+        if self._view_dirty:
+            self._recalculate()
+        return self._view_transform
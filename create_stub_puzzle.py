@@ -6,6 +6,95 @@ from pathlib import Path
 import numpy as np
 from PIL import Image
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
+
+CIRCLE_REGION_ID = 17
+
+
+def _build_region_ids_numpy(
+    size: int, grid_cells: int, cell_size: int, center: int, radius: int
+) -> np.ndarray:
+    """Build the stub region ID map with vectorized NumPy ops.
+
+    Args:
+        size: Puzzle dimensions (size x size pixels).
+        grid_cells: Number of grid cells per side.
+        cell_size: Side length of each grid cell in pixels.
+        center: Center of the circle region (both axes).
+        radius: Radius of the circle region.
+
+    Returns:
+        (size, size) uint32 region ID map.
+    """
+    region_ids = np.zeros((size, size), dtype=np.uint32)
+
+    # Fill grid cells (regions 1-16)
+    cells = (
+        np.arange(grid_cells).reshape(-1, 1) * grid_cells
+        + np.arange(grid_cells).reshape(1, -1)
+        + 1
+    ).astype(np.uint32)
+    grid_extent = cell_size * grid_cells
+    region_ids[:grid_extent, :grid_extent] = cells.repeat(cell_size, 0).repeat(
+        cell_size, 1
+    )
+
+    # Add a center circle (region 17)
+    ys, xs = np.ogrid[:size, :size]
+    mask = (xs - center) ** 2 + (ys - center) ** 2 < radius * radius
+    region_ids[mask] = CIRCLE_REGION_ID
+
+    return region_ids
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _build_region_ids_jit(
+        size: int, grid_cells: int, cell_size: int, center: int, radius: int
+    ) -> np.ndarray:
+        """Build the stub region ID map in a single row-parallel pass."""
+        out = np.empty((size, size), dtype=np.uint32)
+        radius_sq = radius * radius
+        for y in prange(size):
+            gy = y // cell_size
+            dy = y - center
+            for x in range(size):
+                gx = x // cell_size
+                dx = x - center
+                if dx * dx + dy * dy < radius_sq:
+                    rid = CIRCLE_REGION_ID
+                elif gx < grid_cells and gy < grid_cells:
+                    rid = gy * grid_cells + gx + 1
+                else:
+                    rid = 0
+                out[y, x] = rid
+        return out
+
+
+def _build_region_ids(
+    size: int, grid_cells: int, cell_size: int, center: int, radius: int
+) -> np.ndarray:
+    """Build the stub region ID map, using Numba when it is installed.
+
+    Args:
+        size: Puzzle dimensions (size x size pixels).
+        grid_cells: Number of grid cells per side.
+        cell_size: Side length of each grid cell in pixels.
+        center: Center of the circle region (both axes).
+        radius: Radius of the circle region.
+
+    Returns:
+        (size, size) uint32 region ID map.
+    """
+    if njit is not None:
+        return _build_region_ids_jit(size, grid_cells, cell_size, center, radius)
+    return _build_region_ids_numpy(size, grid_cells, cell_size, center, radius)
+
 
 def create_stub_puzzle(output_dir: Path, size: int = 128) -> None:
     """Create a simple stub puzzle with a grid pattern.
@@ -21,29 +110,13 @@ def create_stub_puzzle(output_dir: Path, size: int = 128) -> None:
     grid_cells = 4
     cell_size = size // grid_cells
 
-    region_ids = np.zeros((size, size), dtype=np.uint32)
-
-    # Fill grid cells (regions 1-16)
-    for gy in range(grid_cells):
-        for gx in range(grid_cells):
-            region_id = gy * grid_cells + gx + 1
-            y_start = gy * cell_size
-            y_end = (gy + 1) * cell_size
-            x_start = gx * cell_size
-            x_end = (gx + 1) * cell_size
-            region_ids[y_start:y_end, x_start:x_end] = region_id
-
-    # Add a center circle (region 17)
     center = size // 2
     radius = size // 6
-    for y in range(size):
-        for x in range(size):
-            if (x - center) ** 2 + (y - center) ** 2 < radius ** 2:
-                region_ids[y, x] = 17
+    region_ids = _build_region_ids(size, grid_cells, cell_size, center, radius)
 
-    # Count unique regions
-    unique_regions = np.unique(region_ids)
-    num_regions = len(unique_regions)
+    # IDs are 0 (border), 1..grid_cells**2 (grid) and the circle, so the
+    # count is known up front without scanning the image
+    num_regions = grid_cells * grid_cells + 2
 
     # Create palette (6 colors for variety)
     palette = [
@@ -56,7 +129,7 @@ def create_stub_puzzle(output_dir: Path, size: int = 128) -> None:
     ]
 
     # Assign colors to regions (cycling through palette)
-    region_color = [i % len(palette) for i in range(num_regions)]
+    region_color = (np.arange(num_regions, dtype=np.int32) % len(palette)).tolist()
 
     # Create puzzle.json
     puzzle_data = {
@@ -77,13 +150,14 @@ def create_stub_puzzle(output_dir: Path, size: int = 128) -> None:
 
     # Encode region IDs as RGB PNG
     # id = r + (g << 8) + (b << 16)
-    r = (region_ids & 0xFF).astype(np.uint8)
-    g = ((region_ids >> 8) & 0xFF).astype(np.uint8)
-    b = ((region_ids >> 16) & 0xFF).astype(np.uint8)
-
-    rgb = np.stack([r, g, b], axis=-1)
+    # Little-endian uint32 bytes are already (r, g, b, 0) per pixel
+    region_ids_le = region_ids.astype("<u4", copy=False)
+    rgb = np.ascontiguousarray(
+        region_ids_le.view(np.uint8).reshape(size, size, 4)[..., :3]
+    )
     img = Image.fromarray(rgb, mode="RGB")
-    img.save(output_dir / "region_ids.png")
+    # Region IDs are long flat runs, so fast zlib still compresses them well
+    img.save(output_dir / "region_ids.png", compress_level=1)
 
     print(f"Created stub puzzle in {output_dir}")
     print(f"  Size: {size}x{size}")
@@ -3,8 +3,14 @@
 Manages the hold-to-fill mechanic including timing, preview, and reject animations.
 """
 
+import math
 from enum import Enum, auto
 
+import numpy as np
+
+# Number of samples in the reject shake lookup table
+_REJECT_LUT_SIZE = 256
+
 
 class FillState(Enum):
     """State of the fill action."""
@@ -14,6 +20,23 @@ class FillState(Enum):
     REJECTING = auto()
 
 
+def _build_reject_offset_lut(duration: float, amplitude: int) -> tuple[int, ...]:
+    """Precompute the decaying horizontal shake offsets for a reject.
+
+    Args:
+        duration: Reject animation duration in seconds.
+        amplitude: Peak shake offset in pixels.
+
+    Returns:
+        Integer pixel offsets sampled evenly over the animation.
+    """
+    t = np.linspace(0.0, 1.0, _REJECT_LUT_SIZE, endpoint=False)
+    # Oscillate at ~20Hz, decaying linearly to zero
+    phase = t * duration * 20 * 2 * math.pi
+    offsets = np.sin(phase) * amplitude * (1.0 - t)
+    return tuple(offsets.astype(np.int8).tolist())
+
+
 class FillController:
     """Manages hold-to-fill mechanics.
 
@@ -21,6 +44,17 @@ class FillController:
     the reject animation timing.
     """
 
+    __slots__ = (
+        "state",
+        "target_region",
+        "fill_color_idx",
+        "progress",
+        "fill_time",
+        "reject_timer",
+        "_is_correct",
+        "_dispatch",
+    )
+
     # Fill timing parameters (from CLAUDE.md)
     PIXELS_PER_SECOND = 12000
     MIN_FILL_TIME = 0.15
@@ -30,6 +64,10 @@ class FillController:
     REJECT_DURATION = 0.3  # Total shake+fade duration in seconds
     SHAKE_AMPLITUDE = 3  # Pixels to shake
 
+    _REJECT_OFFSET_LUT = _build_reject_offset_lut(REJECT_DURATION, SHAKE_AMPLITUDE)
+    _REJECT_LUT_SCALE = _REJECT_LUT_SIZE / REJECT_DURATION
+    _REJECT_ALPHA_SCALE = 255 / REJECT_DURATION
+
     def __init__(self) -> None:
         """Initialize fill controller."""
         self.state = FillState.IDLE
@@ -40,6 +78,13 @@ class FillController:
         self.reject_timer: float = 0.0
         self._is_correct: bool = False
 
+        # Per-state update handlers
+        self._dispatch = {
+            FillState.IDLE: self._update_idle,
+            FillState.FILLING: self._update_filling,
+            FillState.REJECTING: self._update_rejecting,
+        }
+
     def start_fill(
         self, region_id: int, region_area: int, palette_idx: int, correct_idx: int
     ) -> None:
@@ -77,40 +122,53 @@ class FillController:
             was_correct indicates if the completed fill was correct.
             region_id is the region that was filled (-1 if not applicable).
         """
-        if self.state == FillState.IDLE:
+        return self._dispatch[self.state](dt_sec, a_held)
+
+    def _update_idle(self, dt_sec: float, a_held: bool) -> tuple[bool, bool, int]:
+        """Idle: nothing to advance."""
+        return (False, False, -1)
+
+    def _update_filling(
+        self, dt_sec: float, a_held: bool
+    ) -> tuple[bool, bool, int]:
+        """Filling: advance progress, then commit or start the reject."""
+        if not a_held:
+            # Released early - cancel
+            self.cancel()
             return (False, False, -1)
 
-        if self.state == FillState.FILLING:
-            if not a_held:
-                # Released early - cancel
-                self.cancel()
-                return (False, False, -1)
-
-            # Update progress
-            self.progress += dt_sec / self.fill_time
-            if self.progress >= 1.0:
-                self.progress = 1.0
-                if self._is_correct:
-                    # Correct fill - complete immediately
-                    completed_region = self.target_region
-                    self._reset()
-                    return (True, True, completed_region)
-                else:
-                    # Wrong fill - start reject animation
-                    self.state = FillState.REJECTING
-                    self.reject_timer = 0.0
-                    return (False, False, -1)
-
-        elif self.state == FillState.REJECTING:
-            self.reject_timer += dt_sec
-            if self.reject_timer >= self.REJECT_DURATION:
-                # Reject animation complete
-                completed_region = self.target_region
-                self._reset()
-                return (True, False, completed_region)
+        # Update progress (on a local, written back once)
+        progress = self.progress + dt_sec / self.fill_time
+        if progress < 1.0:
+            self.progress = progress
+            return (False, False, -1)
+
+        self.progress = 1.0
+        if self._is_correct:
+            # Correct fill - complete immediately
+            completed_region = self.target_region
+            self._reset()
+            return (True, True, completed_region)
 
+        # Wrong fill - start reject animation
+        self.state = FillState.REJECTING
+        self.reject_timer = 0.0
         return (False, False, -1)
 
+    def _update_rejecting(
+        self, dt_sec: float, a_held: bool
+    ) -> tuple[bool, bool, int]:
+        """Rejecting: advance the shake/fade animation."""
+        reject_timer = self.reject_timer + dt_sec
+        if reject_timer < self.REJECT_DURATION:
+            self.reject_timer = reject_timer
+            return (False, False, -1)
+
+        # Reject animation complete
+        completed_region = self.target_region
+        self._reset()
+        return (True, False, completed_region)
+
     def cancel(self) -> None:
         """Cancel the current fill action."""
         if self.state == FillState.FILLING:
@@ -147,15 +205,9 @@ class FillController:
         if self.state != FillState.REJECTING:
             return (0, 0)
 
-        # Shake back and forth, decaying over time
-        t = self.reject_timer / self.REJECT_DURATION
-        decay = 1.0 - t
-        # Oscillate at ~20Hz
-        import math
-
-        phase = self.reject_timer * 20 * 2 * math.pi
-        offset = int(math.sin(phase) * self.SHAKE_AMPLITUDE * decay)
-        return (offset, 0)
+        # Shake back and forth, decaying over time (precomputed)
+        i = min(_REJECT_LUT_SIZE - 1, int(self.reject_timer * self._REJECT_LUT_SCALE))
+        return (self._REJECT_OFFSET_LUT[i], 0)
 
     def get_reject_alpha(self) -> int:
         """Get alpha value for reject animation fade.
@@ -166,5 +218,4 @@ class FillController:
         if self.state != FillState.REJECTING:
             return 255
 
-        t = self.reject_timer / self.REJECT_DURATION
-        return int(255 * (1.0 - t))
+        return int(255 - self.reject_timer * self._REJECT_ALPHA_SCALE)
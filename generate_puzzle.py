@@ -12,15 +12,11 @@ Examples:
 import argparse
 from pathlib import Path
 
-from generators import (
-    get_generator,
-    create_puzzle,
-    PRESETS,
-)
-
 
 def main() -> None:
     """Main entry point for puzzle generation CLI."""
+    from generators import PRESETS, create_puzzle, get_generator
+
     parser = argparse.ArgumentParser(
         description="Generate mandala puzzles for BusyBrainPaint",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -6,13 +6,34 @@ mandala-style paint-by-numbers puzzles.
 Available generators:
 - VoronoiMandalaGenerator (Preset A): Stained-glass organic cells
 - StainedGlassGenerator (Preset B): Bold outlines, big fills
+
+Generator and export modules are imported lazily on first attribute
+access, so tools that only need the cleanup utilities (e.g.
+image_to_puzzle.py) don't pay for loading every generator.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any, NamedTuple
+
 from .base import BaseGenerator, GeneratorParams, GeneratedPuzzle
 from .cleanup import cleanup_regions, merge_tiny_regions, smooth_boundaries, remap_to_contiguous
-from .voronoi_mandala import VoronoiMandalaGenerator, VoronoiMandalaParams
-from .stained_glass import StainedGlassGenerator, StainedGlassParams
-from .export import export_puzzle, create_puzzle, generate_palette
+
+if TYPE_CHECKING:
+    from .voronoi_mandala import VoronoiMandalaGenerator, VoronoiMandalaParams
+    from .stained_glass import StainedGlassGenerator, StainedGlassParams
+    from .export import export_puzzle, create_puzzle, create_puzzles, generate_palette
+
+# Lazily imported names -> submodule that defines them
+_LAZY = {
+    "VoronoiMandalaGenerator": ".voronoi_mandala",
+    "VoronoiMandalaParams": ".voronoi_mandala",
+    "StainedGlassGenerator": ".stained_glass",
+    "StainedGlassParams": ".stained_glass",
+    "export_puzzle": ".export",
+    "create_puzzle": ".export",
+    "create_puzzles": ".export",
+    "generate_palette": ".export",
+}
 
 __all__ = [
     # Base classes
@@ -32,23 +53,66 @@ __all__ = [
     # Export functions
     "export_puzzle",
     "create_puzzle",
+    "create_puzzles",
     "generate_palette",
+    # Presets
+    "Preset",
+    "PRESETS",
+    "get_generator",
 ]
 
 
-# Preset configurations for easy access
-PRESETS = {
-    "voronoi_mandala": {
-        "generator": VoronoiMandalaGenerator,
-        "params": VoronoiMandalaParams,
-        "description": "Stained-glass / organic cell mandalas",
-    },
-    "stained_glass": {
-        "generator": StainedGlassGenerator,
-        "params": StainedGlassParams,
-        "description": "Bold outlines, big satisfying fills",
-    },
-}
+class Preset(NamedTuple):
+    """A generator preset: generator class, its params class, and help text."""
+
+    generator: type[BaseGenerator]
+    params: type[GeneratorParams]
+    description: str
+
+
+def _build_presets() -> dict[str, Preset]:
+    """Import the generator modules and build the preset table."""
+    from .voronoi_mandala import VoronoiMandalaGenerator, VoronoiMandalaParams
+    from .stained_glass import StainedGlassGenerator, StainedGlassParams
+
+    return {
+        "voronoi_mandala": Preset(
+            VoronoiMandalaGenerator,
+            VoronoiMandalaParams,
+            "Stained-glass / organic cell mandalas",
+        ),
+        "stained_glass": Preset(
+            StainedGlassGenerator,
+            StainedGlassParams,
+            "Bold outlines, big satisfying fills",
+        ),
+    }
+
+
+def _get_presets() -> dict[str, Preset]:
+    """Return the preset table, building it on first use."""
+    presets = globals().get("PRESETS")
+    if presets is None:
+        presets = _build_presets()
+        globals()["PRESETS"] = presets
+    return presets
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily imported generators, export helpers, and PRESETS."""
+    if name == "PRESETS":
+        return _get_presets()
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List public names, including lazily imported ones."""
+    return sorted(set(globals()) | set(__all__))
 
 
 def get_generator(preset_name: str, **kwargs) -> BaseGenerator:
@@ -64,10 +128,11 @@ def get_generator(preset_name: str, **kwargs) -> BaseGenerator:
     Raises:
         ValueError: If preset_name is not recognized.
     """
-    if preset_name not in PRESETS:
-        available = ", ".join(PRESETS.keys())
+    presets = _get_presets()
+    preset = presets.get(preset_name)
+    if preset is None:
+        available = ", ".join(presets.keys())
         raise ValueError(f"Unknown preset: {preset_name}. Available: {available}")
 
-    preset = PRESETS[preset_name]
-    params = preset["params"](**kwargs)
-    return preset["generator"](params)
+    generator_cls, params_cls, _ = preset
+    return generator_cls(params_cls(**kwargs))
@@ -1,12 +1,20 @@
 """Base generator class for BusyBrainPaint puzzle generation."""
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import os
 import random
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
 from .cleanup import (
+    build_adjacency,
     cleanup_regions,
     merge_tiny_regions,
     smooth_boundaries,
@@ -14,6 +22,80 @@ from .cleanup import (
 )
 
 
+def _region_id_dtype(max_id: int) -> np.dtype:
+    """Get the narrowest dtype for a region ID map holding IDs up to max_id.
+
+    Args:
+        max_id: Largest region ID the map must be able to hold.
+
+    Returns:
+        uint8 or uint16 when the IDs fit, int32 otherwise.
+    """
+    if max_id < 1 << 8:
+        return np.dtype(np.uint8)
+    if max_id < 1 << 16:
+        return np.dtype(np.uint16)
+    return np.dtype(np.int32)
+
+
+def _voronoi_stripe(
+    seeds: list[tuple[float, float]], out: np.ndarray, y0: int
+) -> None:
+    """Fill rows of a Voronoi map by one NumPy sweep per seed.
+
+    Args:
+        seeds: Seed points as (x, y) pairs.
+        out: Output rows, overwritten with each pixel's nearest seed index.
+        y0: Image row of the first row of out.
+    """
+    height, width = out.shape
+    y_grid = np.arange(y0, y0 + height, dtype=np.float32).reshape(-1, 1)
+    x_grid = np.arange(width, dtype=np.float32).reshape(1, -1)
+
+    # Initialize with large distances
+    min_dist = np.full((height, width), np.inf, dtype=np.float32)
+    out.fill(0)
+
+    # Per-seed scratch, reused so the sweep allocates nothing per point
+    dist = np.empty((height, width), dtype=np.float32)
+    closer = np.empty((height, width), dtype=bool)
+
+    # Assign each pixel to nearest point
+    for i, (px, py) in enumerate(seeds):
+        # Distance is separable: square a (1, W) row and an (H, 1) column,
+        # leaving only the broadcast add at full size
+        dx2 = x_grid - px
+        dx2 *= dx2
+        dy2 = y_grid - py
+        dy2 *= dy2
+        np.add(dx2, dy2, out=dist)
+        np.less(dist, min_dist, out=closer)
+        np.minimum(min_dist, dist, out=min_dist)
+        np.copyto(out, i, where=closer)
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _voronoi_jit(px: np.ndarray, py: np.ndarray, out: np.ndarray) -> None:
+        """Write each pixel's nearest seed into out in one row-parallel pass."""
+        height, width = out.shape
+        for y in prange(height):
+            fy = np.float32(y)
+            for x in range(width):
+                fx = np.float32(x)
+                best = np.float32(np.inf)
+                best_i = 0
+                for i in range(px.shape[0]):
+                    dx = fx - px[i]
+                    dy = fy - py[i]
+                    d = dx * dx + dy * dy
+                    if d < best:
+                        best = d
+                        best_i = i
+                out[y, x] = best_i
+
+
 @dataclass
 class GeneratorParams:
     """Common parameters for all generators."""
@@ -52,6 +134,9 @@ class BaseGenerator(ABC):
         self.rng = random.Random(params.seed)
         self.np_rng = np.random.default_rng(params.seed)
 
+        # Outside-circle masks keyed by (height, width)
+        self._circle_outside_cache: dict[tuple[int, int], np.ndarray] = {}
+
     @abstractmethod
     def generate(self) -> GeneratedPuzzle:
         """Generate a puzzle.
@@ -94,7 +179,9 @@ class BaseGenerator(ABC):
     def _assign_colors(self, region_ids: np.ndarray, num_colors: int) -> list[int]:
         """Assign colors to regions using graph coloring.
 
-        Tries to ensure adjacent regions have different colors.
+        Tries to ensure adjacent regions have different colors. Regions are
+        colored in descending degree order, which leaves fewer regions with
+        every color already taken by a neighbor.
 
         Args:
             region_ids: Region ID map.
@@ -105,27 +192,16 @@ class BaseGenerator(ABC):
         """
         num_regions = int(np.max(region_ids)) + 1
 
-        # Build adjacency
-        adj: list[set[int]] = [set() for _ in range(num_regions)]
-        height, width = region_ids.shape
-
-        for y in range(height):
-            for x in range(width - 1):
-                r1, r2 = region_ids[y, x], region_ids[y, x + 1]
-                if r1 != r2:
-                    adj[r1].add(r2)
-                    adj[r2].add(r1)
+        adj = build_adjacency(region_ids, num_regions)
 
-        for y in range(height - 1):
-            for x in range(width):
-                r1, r2 = region_ids[y, x], region_ids[y + 1, x]
-                if r1 != r2:
-                    adj[r1].add(r2)
-                    adj[r2].add(r1)
+        # Greedy graph coloring, largest degree first (Welsh-Powell)
+        degrees = np.fromiter(
+            (len(neighbors) for neighbors in adj), dtype=np.int32, count=num_regions
+        )
+        order = np.argsort(-degrees, kind="stable").tolist()
 
-        # Greedy graph coloring
         colors = [-1] * num_regions
-        for region in range(num_regions):
+        for region in order:
             used = {colors[n] for n in adj[region] if colors[n] >= 0}
             for c in range(num_colors):
                 if c not in used:
@@ -137,6 +213,88 @@ class BaseGenerator(ABC):
 
         return colors
 
+    def _compute_voronoi(
+        self,
+        points: np.ndarray | list[tuple[float, float]],
+        width: int,
+        height: int,
+    ) -> np.ndarray:
+        """Compute Voronoi diagram by assigning each pixel to nearest point.
+
+        Runs an exact nearest-seed search on the unrounded seeds, as a
+        parallel Numba kernel when numba is installed or as NumPy sweeps
+        over horizontal stripes in a thread pool if not. Both backends use
+        the same float32 arithmetic and give ties to the first seed, so a
+        preset regenerates identically either way. A scipy cKDTree query
+        is not used: its float64 distances and tie-breaking would make the
+        output depend on whether scipy is installed.
+
+        The map uses the narrowest dtype that holds every seed index plus
+        the extra IDs later added for lead and the outside border, so
+        every later pass over it moves fewer bytes.
+
+        Args:
+            points: Seed points as an (N, 2) array or list of (x, y) pairs.
+            width: Image width.
+            height: Image height.
+
+        Returns:
+            Region ID array where each pixel is assigned to nearest point.
+        """
+        dtype = _region_id_dtype(len(points) + 1)
+
+        if njit is not None and len(points) > 0:
+            seeds = np.asarray(points, dtype=np.float32)
+            region_ids = np.empty((height, width), dtype=dtype)
+            _voronoi_jit(
+                np.ascontiguousarray(seeds[:, 0]),
+                np.ascontiguousarray(seeds[:, 1]),
+                region_ids,
+            )
+            return region_ids
+
+        # NumPy ufuncs release the GIL, so horizontal stripes sweep in
+        # parallel threads, each writing its own rows of the output
+        region_ids = np.zeros((height, width), dtype=dtype)
+        seed_list = [(float(px), float(py)) for px, py in points]
+        num_stripes = max(1, min(os.cpu_count() or 1, height))
+        bounds = np.linspace(0, height, num_stripes + 1).astype(int).tolist()
+        if num_stripes == 1:
+            _voronoi_stripe(seed_list, region_ids, 0)
+            return region_ids
+        with ThreadPoolExecutor(max_workers=num_stripes) as pool:
+            futures = [
+                pool.submit(_voronoi_stripe, seed_list, region_ids[y0:y1], y0)
+                for y0, y1 in zip(bounds[:-1], bounds[1:])
+            ]
+            for future in futures:
+                future.result()
+
+        return region_ids
+
+    def _circle_outside_mask(self, height: int, width: int) -> np.ndarray:
+        """Get the (cached, read-only) mask of pixels outside the circle.
+
+        Args:
+            height: Map height in pixels.
+            width: Map width in pixels.
+
+        Returns:
+            HxW bool array, True outside the inscribed circle.
+        """
+        key = (height, width)
+        outside = self._circle_outside_cache.get(key)
+        if outside is None:
+            # Work in doubled coordinates so the half-pixel center and radius
+            # (cx = width / 2, radius = min / 2 - 1) stay exact in int32
+            dx2 = (2 * np.arange(width, dtype=np.int32) - width) ** 2
+            dy2 = (2 * np.arange(height, dtype=np.int32) - height) ** 2
+            diameter = min(height, width) - 2
+            outside = np.add.outer(dy2, dx2) > diameter * diameter
+            outside.flags.writeable = False
+            self._circle_outside_cache[key] = outside
+        return outside
+
     def _clip_to_circle(self, region_ids: np.ndarray, border_id: int = -1) -> np.ndarray:
         """Clip regions to a circle, setting outside pixels to border_id.
 
@@ -147,20 +305,26 @@ class BaseGenerator(ABC):
         Returns:
             Clipped region ID map.
         """
-        height, width = region_ids.shape
-        cy, cx = height / 2, width / 2
-        radius = min(height, width) / 2 - 1
-
-        y_coords, x_coords = np.ogrid[:height, :width]
-        dist_sq = (x_coords - cx) ** 2 + (y_coords - cy) ** 2
-        outside = dist_sq > radius * radius
-
-        result = region_ids.copy()
-        if border_id >= 0:
-            result[outside] = border_id
-        else:
+        outside = self._circle_outside_mask(*region_ids.shape)
+
+        if border_id < 0:
             # Mark outside as a new region
-            max_id = int(np.max(region_ids))
-            result[outside] = max_id + 1
+            border_id = int(np.max(region_ids)) + 1
+
+        result = self._copy_for_new_id(region_ids, border_id)
+        result[outside] = border_id
 
         return result
+
+    def _copy_for_new_id(self, region_ids: np.ndarray, new_id: int) -> np.ndarray:
+        """Copy a region ID map, widening its dtype if new_id would not fit.
+
+        Args:
+            region_ids: Region ID map.
+            new_id: Region ID about to be written into the copy.
+
+        Returns:
+            Copy of region_ids whose dtype can hold new_id.
+        """
+        dtype = np.promote_types(region_ids.dtype, _region_id_dtype(new_id))
+        return region_ids.astype(dtype)
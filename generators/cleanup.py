@@ -6,76 +6,304 @@ and the image-to-puzzle converter.
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
+# Pixels per band of rows when accumulating region moments
+_MOMENT_BAND_PIXELS = 1 << 16
+
+
+def _boundary_pairs_numpy(
+    region_ids: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Collect boundary ID pairs with vectorized NumPy ops."""
+    a = np.concatenate([region_ids[:, :-1].ravel(), region_ids[:-1, :].ravel()])
+    b = np.concatenate([region_ids[:, 1:].ravel(), region_ids[1:, :].ravel()])
+    diff = a != b
+    return a[diff], b[diff]
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _boundary_pairs_jit(
+        region_ids: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Collect boundary ID pairs in one scan, writing only the hits."""
+        h, w = region_ids.shape
+        capacity = max(h * (w - 1), 0) + max((h - 1) * w, 0)
+        a = np.empty(capacity, dtype=region_ids.dtype)
+        b = np.empty(capacity, dtype=region_ids.dtype)
+        k = 0
+        for y in range(h):
+            for x in range(w - 1):
+                r1 = region_ids[y, x]
+                r2 = region_ids[y, x + 1]
+                if r1 != r2:
+                    a[k] = r1
+                    b[k] = r2
+                    k += 1
+        for y in range(h - 1):
+            for x in range(w):
+                r1 = region_ids[y, x]
+                r2 = region_ids[y + 1, x]
+                if r1 != r2:
+                    a[k] = r1
+                    b[k] = r2
+                    k += 1
+        return a[:k], b[:k]
+
+
+def boundary_pairs(region_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Collect the ID pairs across every 4-connected region boundary.
+
+    Uses a Numba kernel when numba is installed.
 
-def merge_tiny_regions(
-    region_ids: np.ndarray, min_area: int = 20
-) -> np.ndarray:
-    """Merge regions smaller than min_area into their largest neighbor.
+    Args:
+        region_ids: Region ID map.
+
+    Returns:
+        Tuple of (a, b) 1D arrays where a[i] != b[i] are the IDs on either
+        side of one horizontal or vertical pixel edge. Each edge appears
+        once, so pair multiplicity equals shared boundary length.
+    """
+    if njit is not None:
+        return _boundary_pairs_jit(np.ascontiguousarray(region_ids))
+    return _boundary_pairs_numpy(region_ids)
+
+
+def adjacency_csr(
+    region_ids: np.ndarray, num_regions: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build the region adjacency graph in CSR form.
+
+    Args:
+        region_ids: Region ID map with IDs in 0..num_regions-1. IDs at or
+            above num_regions are ignored.
+        num_regions: Total number of regions.
+
+    Returns:
+        Tuple of (indptr, indices): the sorted neighbors of region i are
+        indices[indptr[i]:indptr[i + 1]], and indptr[i + 1] - indptr[i] is
+        its degree.
+    """
+    a, b = boundary_pairs(region_ids)
+    a = a.astype(np.int64, copy=False)
+    b = b.astype(np.int64, copy=False)
+    keep = (a < num_regions) & (b < num_regions)
+    a = a[keep]
+    b = b[keep]
+
+    # Deduplicate the (many) boundary pixels as undirected (lo, hi) keys
+    # first, then mirror only the (few) unique edges into both directions
+    edges = np.unique(np.minimum(a, b) * num_regions + np.maximum(a, b))
+    lo = edges // num_regions
+    hi = edges % num_regions
+    keys = np.sort(np.concatenate([lo * num_regions + hi, hi * num_regions + lo]))
+    rows = keys // num_regions
+    indices = keys % num_regions
+    indptr = np.zeros(num_regions + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_regions), out=indptr[1:])
+    return indptr, indices
+
+
+def build_adjacency(region_ids: np.ndarray, num_regions: int) -> list[set[int]]:
+    """Build the region adjacency graph as per-region neighbor sets.
+
+    Args:
+        region_ids: Region ID map with IDs in 0..num_regions-1. IDs at or
+            above num_regions are ignored.
+        num_regions: Total number of regions.
+
+    Returns:
+        List where adj[i] is the set of region IDs adjacent to region i.
+    """
+    indptr, indices = adjacency_csr(region_ids, num_regions)
+    bounds = indptr.tolist()
+    neighbors = indices.tolist()
+    return [set(neighbors[bounds[i] : bounds[i + 1]]) for i in range(num_regions)]
+
+
+def region_moments(
+    region_ids: np.ndarray, num_regions: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute each region's pixel count and coordinate sums.
+
+    Accumulates over bands of rows so the coordinate weights are only one
+    band in size instead of two full HxW grids. Within a band, y is the
+    band offset plus a local row index, so the offset part is a count.
+    All sums are integer-valued float64, so they are exact.
+
+    Args:
+        region_ids: Region ID map with IDs in 0..num_regions-1.
+        num_regions: Total number of regions.
+
+    Returns:
+        Tuple of (counts, sum_x, sum_y) float64 arrays of length
+        num_regions.
+    """
+    height, width = region_ids.shape
+    band = max(1, _MOMENT_BAND_PIXELS // max(width, 1))
+    x_weights = np.tile(np.arange(width, dtype=np.float64), band)
+    y_weights = np.repeat(np.arange(band, dtype=np.float64), width)
+
+    counts = np.zeros(num_regions, dtype=np.float64)
+    sum_x = np.zeros(num_regions, dtype=np.float64)
+    sum_y = np.zeros(num_regions, dtype=np.float64)
+    for y0 in range(0, height, band):
+        rows = region_ids[y0 : y0 + band].ravel()
+        n = rows.size
+        band_counts = np.bincount(rows, minlength=num_regions)
+        counts += band_counts
+        sum_x += np.bincount(rows, weights=x_weights[:n], minlength=num_regions)
+        sum_y += np.bincount(rows, weights=y_weights[:n], minlength=num_regions)
+        sum_y += y0 * band_counts
+
+    return counts, sum_x, sum_y
+
+
+def _label_areas(
+    region_ids: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compact region IDs to 0..N-1 labels and count each label's area.
+
+    Small non-negative IDs (the common case once cleanup_regions has
+    narrowed them) are counted with one bincount and compacted with a LUT,
+    avoiding the sort inside np.unique.
 
     Args:
         region_ids: Region ID map.
-        min_area: Minimum region area to keep.
 
     Returns:
-        Region ID map with tiny regions merged.
+        Tuple of (unique_ids, labels, areas): the sorted distinct IDs, a
+        flat array of each pixel's index into unique_ids, and the pixel
+        count of each distinct ID.
     """
-    unique_ids = np.unique(region_ids)
-    areas = {rid: np.sum(region_ids == rid) for rid in unique_ids}
-
-    tiny_regions = [rid for rid, area in areas.items() if area < min_area]
-
-    for tiny_id in tiny_regions:
-        mask = region_ids == tiny_id
-        # Dilate mask to find neighbors
-        dilated = np.zeros_like(mask)
-        dilated[:-1, :] |= mask[1:, :]
-        dilated[1:, :] |= mask[:-1, :]
-        dilated[:, :-1] |= mask[:, 1:]
-        dilated[:, 1:] |= mask[:, :-1]
-        neighbor_mask = dilated & ~mask
-
-        if np.any(neighbor_mask):
-            neighbor_ids = region_ids[neighbor_mask]
-            neighbor_counts: dict[int, int] = {}
-            for nid in neighbor_ids:
-                if nid != tiny_id:
-                    neighbor_counts[nid] = neighbor_counts.get(nid, 0) + 1
-            if neighbor_counts:
-                best_neighbor = max(neighbor_counts, key=neighbor_counts.get)
-                region_ids[mask] = best_neighbor
-
-    return region_ids
+    flat = region_ids.ravel()
+    if flat.size and flat.dtype.kind in "iu":
+        lo, hi = int(flat.min()), int(flat.max())
+        if lo >= 0 and hi <= flat.size:
+            counts = np.bincount(flat.astype(np.intp, copy=False), minlength=hi + 1)
+            present = counts > 0
+            unique_ids = np.flatnonzero(present).astype(region_ids.dtype)
+            lut = np.cumsum(present) - 1
+            return unique_ids, lut[flat], counts[present]
 
+    unique_ids, inverse = np.unique(flat, return_inverse=True)
+    return unique_ids, inverse, np.bincount(inverse, minlength=unique_ids.size)
 
-def smooth_boundaries(
-    region_ids: np.ndarray, iterations: int = 2
+
+def merge_tiny_regions(
+    region_ids: np.ndarray, min_area: int = 20
 ) -> np.ndarray:
-    """Smooth jagged region boundaries using a majority-vote mode filter.
+    """Merge regions smaller than min_area into their largest neighbor.
 
-    Only boundary pixels (those with a 4-neighbor of different ID) are
-    modified.  A pixel is reassigned only when a strict majority (>=5 of 9)
-    of its 3x3 neighborhood agrees on a single ID, which protects thin
-    structures like stained-glass lead lines.
+    The neighbor chosen for each tiny region is the one sharing the longest
+    boundary with it (ties go to the lower ID). Tiny regions are visited in
+    ID order and merges chain, so a tiny region absorbed into another tiny
+    region moves with it; a region is never merged back into itself.
 
     Args:
         region_ids: Region ID map.
-        iterations: Number of smoothing passes.
+        min_area: Minimum region area to keep.
 
     Returns:
-        Region ID map with smoother boundaries.
+        Region ID map with tiny regions merged.
     """
-    result = region_ids.copy()
+    unique_ids, inverse, areas = _label_areas(region_ids)
+    num_ids = unique_ids.size
+
+    is_tiny = areas < min_area
+    if not np.any(is_tiny):
+        return region_ids
+
+    # Boundary lengths between each tiny region and its neighbors, from one
+    # vectorized pass over the region adjacency edges
+    labels = inverse.reshape(region_ids.shape)
+    a, b = boundary_pairs(labels)
+    src = np.concatenate([a, b])
+    dst = np.concatenate([b, a])
+    keep = is_tiny[src]
+    pair_keys, pair_counts = np.unique(
+        src[keep].astype(np.int64) * num_ids + dst[keep], return_counts=True
+    )
+    pair_src = pair_keys // num_ids
+    pair_dst = pair_keys % num_ids
+
+    # Order candidates per tiny region: longest shared boundary, then lowest ID
+    order = np.lexsort((pair_dst, -pair_counts, pair_src))
+    pair_src = pair_src[order]
+    pair_dst = pair_dst[order].tolist()
+    tiny_labels = np.flatnonzero(is_tiny)
+    starts = np.searchsorted(pair_src, tiny_labels, side="left").tolist()
+    ends = np.searchsorted(pair_src, tiny_labels, side="right").tolist()
+
+    # Resolve merges with union-find so chained merges land on the final root
+    parent = list(range(num_ids))
+
+    def find(x: int) -> int:
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    for tiny, start, end in zip(tiny_labels.tolist(), starts, ends):
+        tiny_root = find(tiny)
+        for neighbor in pair_dst[start:end]:
+            neighbor_root = find(neighbor)
+            if neighbor_root != tiny_root:
+                parent[tiny_root] = neighbor_root
+                break
+
+    # Resolve remaining chains by pointer jumping (the union-find forest
+    # has no cycles), then apply every merge with a single LUT gather
+    roots = np.array(parent, dtype=np.intp)
+    while True:
+        jumped = roots[roots]
+        if np.array_equal(jumped, roots):
+            break
+        roots = jumped
+    return unique_ids[roots][labels]
 
-    for _ in range(iterations):
-        # Pad by 1 on each side (replicate edge values)
-        padded = np.pad(result, 1, mode="edge")
 
-        # Build 9 shifted views of the 3x3 neighborhood
-        h, w = result.shape
-        views = []
-        for dy in range(3):
-            for dx in range(3):
-                views.append(padded[dy : dy + h, dx : dx + w])
+def _smooth_boundaries_numpy(
+    region_ids: np.ndarray, iterations: int = 2
+) -> np.ndarray:
+    """Mode-filter boundary pixels with vectorized NumPy ops."""
+    # Vote on compact uint8 labels when they fit, so compares and the
+    # gathered neighbor stack move a quarter (or less) of the bytes
+    unique_ids, inverse = np.unique(region_ids, return_inverse=True)
+    compact = unique_ids.size <= 256
+    if compact:
+        source = inverse.reshape(region_ids.shape)
+        dtype = np.uint8
+    else:
+        source = region_ids
+        dtype = region_ids.dtype
+
+    # Allocate the padded buffer once; result is its interior, so updates
+    # land in place and only the 1-pixel edge needs refreshing per pass
+    h, w = region_ids.shape
+    padded = np.empty((h + 2, w + 2), dtype=dtype)
+    result = padded[1:-1, 1:-1]
+    result[...] = source
+
+    # Build 9 shifted views of the 3x3 neighborhood
+    views = []
+    for dy in range(3):
+        for dx in range(3):
+            views.append(padded[dy : dy + h, dx : dx + w])
+
+    for _ in range(iterations):
+        # Replicate edge values into the padding
+        padded[0, 1:-1] = padded[1, 1:-1]
+        padded[-1, 1:-1] = padded[-2, 1:-1]
+        padded[:, 0] = padded[:, 1]
+        padded[:, -1] = padded[:, -2]
 
         # Identify boundary pixels: any 4-connected neighbor differs
         center = views[4]  # (1,1) offset = center
@@ -95,11 +323,14 @@ def smooth_boundaries(
             [v[boundary_indices] for v in views], axis=0
         )
 
-        # For each neighbor position, count how many of the 9 match it
-        counts = np.zeros_like(neighbor_vals, dtype=np.int32)
+        # For each neighbor position, count how many of the 9 match it.
+        # Equality is symmetric, so each of the 36 pairs is compared once
+        counts = np.ones(neighbor_vals.shape, dtype=np.uint8)
         for j in range(9):
-            for k in range(9):
-                counts[j] += neighbor_vals[k] == neighbor_vals[j]
+            for k in range(j + 1, 9):
+                eq = neighbor_vals[j] == neighbor_vals[k]
+                counts[j] += eq
+                counts[k] += eq
 
         # Find the neighbor position with the highest vote count per pixel
         best_pos = np.argmax(counts, axis=0)
@@ -111,6 +342,82 @@ def smooth_boundaries(
         by, bx = boundary_indices
         result[by[apply_mask], bx[apply_mask]] = best_val[apply_mask]
 
+    if compact:
+        return unique_ids[result]
+    return result.copy()
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _smooth_pass(src: np.ndarray, out: np.ndarray) -> None:
+        """Run one mode-filter pass from src into out, row-parallel."""
+        h, w = src.shape
+        for y in prange(h):
+            window = np.empty(9, dtype=src.dtype)
+            y0 = max(y - 1, 0)
+            y2 = min(y + 1, h - 1)
+            for x in range(w):
+                x0 = max(x - 1, 0)
+                x2 = min(x + 1, w - 1)
+                c = src[y, x]
+                out[y, x] = c
+
+                # Only boundary pixels (a 4-neighbor differs) are candidates
+                if (
+                    src[y0, x] == c
+                    and src[y2, x] == c
+                    and src[y, x0] == c
+                    and src[y, x2] == c
+                ):
+                    continue
+
+                i = 0
+                for dy in range(-1, 2):
+                    yy = min(max(y + dy, 0), h - 1)
+                    for dx in range(-1, 2):
+                        xx = min(max(x + dx, 0), w - 1)
+                        window[i] = src[yy, xx]
+                        i += 1
+
+                # At most one ID can hold a strict majority
+                for j in range(9):
+                    count = 0
+                    for k in range(9):
+                        if window[k] == window[j]:
+                            count += 1
+                    if count >= 5:
+                        out[y, x] = window[j]
+                        break
+
+
+def smooth_boundaries(
+    region_ids: np.ndarray, iterations: int = 2
+) -> np.ndarray:
+    """Smooth jagged region boundaries using a majority-vote mode filter.
+
+    Only boundary pixels (those with a 4-neighbor of different ID) are
+    modified.  A pixel is reassigned only when a strict majority (>=5 of 9)
+    of its 3x3 neighborhood agrees on a single ID, which protects thin
+    structures like stained-glass lead lines.  Uses a Numba kernel when
+    numba is installed.
+
+    Args:
+        region_ids: Region ID map.
+        iterations: Number of smoothing passes.
+
+    Returns:
+        Region ID map with smoother boundaries.
+    """
+    if njit is None:
+        return _smooth_boundaries_numpy(region_ids, iterations)
+
+    # Ping-pong between two buffers instead of allocating per pass
+    result = np.ascontiguousarray(region_ids).copy()
+    scratch = np.empty_like(result)
+    for _ in range(iterations):
+        _smooth_pass(result, scratch)
+        result, scratch = scratch, result
     return result
 
 
@@ -123,12 +430,9 @@ def remap_to_contiguous(region_ids: np.ndarray) -> np.ndarray:
     Returns:
         Region ID map with IDs 0..N-1.
     """
-    unique_ids = np.unique(region_ids)
-    mapping = {old: new for new, old in enumerate(unique_ids)}
-    result = np.zeros_like(region_ids)
-    for old, new in mapping.items():
-        result[region_ids == old] = new
-    return result
+    # The inverse indices from np.unique are exactly the contiguous labels
+    _, inverse = np.unique(region_ids, return_inverse=True)
+    return inverse.reshape(region_ids.shape).astype(region_ids.dtype, copy=False)
 
 
 def cleanup_regions(
@@ -136,7 +440,8 @@ def cleanup_regions(
 ) -> np.ndarray:
     """Clean up regions by merging tiny ones and smoothing boundaries.
 
-    Orchestrates: merge -> smooth -> re-merge -> remap.
+    Orchestrates: merge -> smooth -> re-merge -> remap.  IDs are processed in
+    the narrowest unsigned dtype that fits and returned in the input dtype.
 
     Args:
         region_ids: Raw region ID map.
@@ -145,7 +450,20 @@ def cleanup_regions(
     Returns:
         Cleaned region ID map with contiguous IDs 0..N-1.
     """
+    out_dtype = region_ids.dtype
+
+    # Work on contiguous IDs in the narrowest dtype that holds them, so every
+    # pass moves fewer bytes. The remap keeps ID order, so results match.
+    region_ids = remap_to_contiguous(region_ids)
+    num_ids = int(region_ids.max()) + 1 if region_ids.size else 0
+    region_ids = region_ids.astype(np.min_scalar_type(max(num_ids - 1, 0)), copy=False)
+
     region_ids = merge_tiny_regions(region_ids, min_area)
     region_ids = smooth_boundaries(region_ids, iterations=2)
-    region_ids = merge_tiny_regions(region_ids, min_area)
-    return remap_to_contiguous(region_ids)
+
+    # Smoothing rarely creates fragments; a bincount (IDs are small and
+    # non-negative here) is much cheaper than the np.unique in a re-merge
+    areas = np.bincount(region_ids.ravel())
+    if areas[areas > 0].min(initial=min_area) < min_area:
+        region_ids = merge_tiny_regions(region_ids, min_area)
+    return remap_to_contiguous(region_ids).astype(out_dtype, copy=False)
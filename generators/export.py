@@ -1,15 +1,27 @@
 """Puzzle export functionality for BusyBrainPaint generators."""
 
+import functools
 import json
 import math
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Sequence
 
 import numpy as np
 from PIL import Image
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to pure Python
+    njit = None
+
 from .base import GeneratedPuzzle, BaseGenerator
+from .cleanup import adjacency_csr, region_moments
 
 
 # Default palette colors (vibrant, distinguishable)
@@ -27,6 +39,42 @@ DEFAULT_PALETTE = [
     (125, 206, 160),  # Light green
     (133, 193, 233),  # Light blue
 ]
+_DEFAULT_PALETTE_ARR = np.array(DEFAULT_PALETTE, dtype=np.float64)
+
+
+def _dumps_json(obj: dict) -> bytes:
+    """Encode obj as 2-space indented JSON, using orjson when installed.
+
+    Args:
+        obj: JSON-serializable data.
+
+    Returns:
+        UTF-8 encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=64)
+def _extended_palette(num_colors: int) -> tuple[tuple[int, int, int], ...]:
+    """Build (and memoize) a palette longer than DEFAULT_PALETTE.
+
+    Args:
+        num_colors: Number of colors needed.
+
+    Returns:
+        Immutable tuple of RGB tuples.
+    """
+    # Additional colors are lightened/darkened copies of the defaults:
+    # level 0 is the defaults, then alternating 1.3x and 0.7x
+    levels = -(-num_colors // len(DEFAULT_PALETTE))
+    factors = np.where(np.arange(levels) % 2 == 0, 0.7, 1.3)
+    factors[0] = 1.0
+    grid = np.clip(
+        _DEFAULT_PALETTE_ARR[None, :, :] * factors[:, None, None], 0, 255
+    ).astype(np.uint8)
+    return tuple(tuple(row) for row in grid.reshape(-1, 3)[:num_colors].tolist())
 
 
 def generate_palette(num_colors: int) -> list[tuple[int, int, int]]:
@@ -40,19 +88,7 @@ def generate_palette(num_colors: int) -> list[tuple[int, int, int]]:
     """
     if num_colors <= len(DEFAULT_PALETTE):
         return DEFAULT_PALETTE[:num_colors]
-
-    # Generate additional colors by interpolation
-    palette = list(DEFAULT_PALETTE)
-    while len(palette) < num_colors:
-        # Add variations of existing colors
-        base_idx = len(palette) % len(DEFAULT_PALETTE)
-        base = DEFAULT_PALETTE[base_idx]
-        # Lighten or darken
-        factor = 0.7 if (len(palette) // len(DEFAULT_PALETTE)) % 2 == 0 else 1.3
-        new_color = tuple(max(0, min(255, int(c * factor))) for c in base)
-        palette.append(new_color)
-
-    return palette[:num_colors]
+    return list(_extended_palette(num_colors))
 
 
 def _compute_centroids(
@@ -68,14 +104,8 @@ def _compute_centroids(
     Returns:
         Array of shape (num_regions, 2) with (cx, cy) per region.
     """
-    height, width = region_ids.shape
-    flat = region_ids.ravel()
-    y_coords, x_coords = np.mgrid[:height, :width]
-
-    counts = np.bincount(flat, minlength=num_regions).astype(np.float64)
+    counts, sum_x, sum_y = region_moments(region_ids, num_regions)
     counts = np.maximum(counts, 1.0)  # avoid division by zero
-    sum_x = np.bincount(flat, weights=x_coords.ravel(), minlength=num_regions)
-    sum_y = np.bincount(flat, weights=y_coords.ravel(), minlength=num_regions)
 
     centroids = np.stack([sum_x / counts, sum_y / counts], axis=-1)
     return centroids
@@ -84,7 +114,7 @@ def _compute_centroids(
 def _build_adjacency(
     region_ids: np.ndarray,
     num_regions: int,
-) -> list[set[int]]:
+) -> tuple[np.ndarray, np.ndarray]:
     """Build region adjacency graph from region ID map.
 
     Args:
@@ -92,32 +122,129 @@ def _build_adjacency(
         num_regions: Total number of regions.
 
     Returns:
-        List where adj[i] is the set of region IDs adjacent to region i.
+        CSR (indptr, indices) arrays; the neighbors of region i are
+        indices[indptr[i]:indptr[i + 1]].
     """
-    height, width = region_ids.shape
-    adj: list[set[int]] = [set() for _ in range(num_regions)]
+    return adjacency_csr(region_ids, num_regions)
+
+
+def _color_groups_python(
+    order: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    num_colors: int,
+) -> np.ndarray:
+    """Greedy cursor coloring of a CSR graph in pure Python."""
+    bounds = indptr.tolist()
+    neighbors = indices.tolist()
+    colors = [-1] * (len(bounds) - 1)
+
+    for cursor, node in enumerate(order.tolist()):
+        used = {
+            colors[n]
+            for n in neighbors[bounds[node] : bounds[node + 1]]
+            if colors[n] >= 0
+        }
+
+        # Try the cursor color first, then the nearest free one after it;
+        # if every color conflicts, keep the cursor color anyway
+        colors[node] = cursor % num_colors
+        for offset in range(num_colors):
+            candidate = (cursor + offset) % num_colors
+            if candidate not in used:
+                colors[node] = candidate
+                break
+
+    return np.array(colors, dtype=np.int64)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _color_groups_jit(
+        order: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        num_colors: int,
+    ) -> np.ndarray:
+        """Greedy cursor coloring of a CSR graph, compiled."""
+        colors = np.full(indptr.size - 1, -1, dtype=np.int64)
+        used = np.zeros(num_colors, dtype=np.bool_)
+
+        for cursor in range(order.size):
+            node = order[cursor]
+            start = indptr[node]
+            end = indptr[node + 1]
+            for k in range(start, end):
+                c = colors[indices[k]]
+                if c >= 0:
+                    used[c] = True
+
+            choice = cursor % num_colors
+            for offset in range(num_colors):
+                candidate = (cursor + offset) % num_colors
+                if not used[candidate]:
+                    choice = candidate
+                    break
+            colors[node] = choice
+
+            # Clear only the flags this node set
+            for k in range(start, end):
+                c = colors[indices[k]]
+                if c >= 0:
+                    used[c] = False
+
+        return colors
 
-    for y in range(height):
-        for x in range(width - 1):
-            r1, r2 = int(region_ids[y, x]), int(region_ids[y, x + 1])
-            if r1 != r2 and r1 < num_regions and r2 < num_regions:
-                adj[r1].add(r2)
-                adj[r2].add(r1)
 
-    for y in range(height - 1):
-        for x in range(width):
-            r1, r2 = int(region_ids[y, x]), int(region_ids[y + 1, x])
-            if r1 != r2 and r1 < num_regions and r2 < num_regions:
-                adj[r1].add(r2)
-                adj[r2].add(r1)
+def _color_groups(
+    order: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    num_colors: int,
+) -> np.ndarray:
+    """Color a CSR graph greedily, cycling a color cursor along order.
+
+    Each node takes the cursor color (advancing once per node) unless a
+    neighbor already has it, in which case it takes the next free color
+    after the cursor. Uses a Numba kernel when numba is installed.
+
+    Args:
+        order: Node visit order.
+        indptr: CSR row pointers.
+        indices: CSR neighbor indices.
+        num_colors: Number of colors available.
+
+    Returns:
+        int64 array of the color index per node.
+    """
+    if njit is not None:
+        return _color_groups_jit(
+            order.astype(np.int64, copy=False),
+            indptr.astype(np.int64, copy=False),
+            indices.astype(np.int64, copy=False),
+            num_colors,
+        )
+    return _color_groups_python(order, indptr, indices, num_colors)
 
-    return adj
+
+def _framework_regions(degrees: np.ndarray) -> np.ndarray:
+    """Find structural regions adjacent to more than half of all regions.
+
+    Args:
+        degrees: Per-region neighbor counts.
+
+    Returns:
+        Ascending IDs of the framework regions (e.g. stained glass lead).
+    """
+    return np.flatnonzero(degrees > degrees.size / 2.0)
 
 
 def assign_region_colors(
     puzzle: GeneratedPuzzle,
     num_colors: int,
     region_ids: np.ndarray,
+    adjacency: tuple[np.ndarray, np.ndarray] | None = None,
 ) -> list[int]:
     """Assign colors to regions using structure-aware grouping.
 
@@ -128,6 +255,8 @@ def assign_region_colors(
         puzzle: Generated puzzle data.
         num_colors: Number of colors available.
         region_ids: Region ID array.
+        adjacency: Precomputed CSR adjacency from _build_adjacency, if the
+            caller already has it.
 
     Returns:
         List mapping region_id -> color_index.
@@ -138,7 +267,10 @@ def assign_region_colors(
 
     # Compute centroids and adjacency
     centroids = _compute_centroids(region_ids, num_regions)
-    adj = _build_adjacency(region_ids, num_regions)
+    if adjacency is None:
+        adjacency = _build_adjacency(region_ids, num_regions)
+    adj_indptr, adj_indices = adjacency
+    degrees = np.diff(adj_indptr)
 
     # Puzzle center
     cx, cy = width / 2.0, height / 2.0
@@ -165,113 +297,84 @@ def assign_region_colors(
     # Quantize into bins to form equivalence groups
     r_bins = 20
     t_bins = max(5, symmetry_slices)
-    r_bin = np.round(r_norm * r_bins).astype(int)
-    t_bin = np.round(theta_folded_norm * t_bins).astype(int)
+    r_bin = np.round(r_norm * r_bins).astype(np.int64)
+    t_bin = np.round(theta_folded_norm * t_bins).astype(np.int64)
 
     # Identify special regions
     border_region = int(region_ids[0, 0])
 
     # Lead region: adjacent to >50% of all regions (stained glass lead lines)
-    lead_region = -1
-    half_regions = num_regions / 2.0
-    for rid in range(num_regions):
-        if len(adj[rid]) > half_regions:
-            lead_region = rid
-            break
+    lead_candidates = _framework_regions(degrees)
+    lead_region = int(lead_candidates[0]) if lead_candidates.size else -1
 
     # Center region: closest centroid to puzzle center (excluding border/lead)
-    center_region = -1
-    min_center_dist = float("inf")
-    for rid in range(num_regions):
-        if rid == border_region or rid == lead_region:
-            continue
-        dist = r[rid]
-        if dist < min_center_dist:
-            min_center_dist = dist
-            center_region = rid
-
-    # Assign regions to groups
-    region_to_group: dict[int, int] = {}
-    group_members: dict[int, list[int]] = defaultdict(list)
-    next_group = 0
-
-    # Special regions get their own groups
-    special_group_ids: dict[int, int] = {}
-    for rid in (border_region, lead_region, center_region):
-        if rid >= 0:
-            gid = next_group
-            next_group += 1
-            region_to_group[rid] = gid
-            group_members[gid].append(rid)
-            special_group_ids[rid] = gid
-
-    # Group remaining regions by (r_bin, t_bin)
-    bin_to_group: dict[tuple[int, int], int] = {}
-    for rid in range(num_regions):
-        if rid in region_to_group:
-            continue
-        key = (int(r_bin[rid]), int(t_bin[rid]))
-        if key not in bin_to_group:
-            bin_to_group[key] = next_group
-            next_group += 1
-        gid = bin_to_group[key]
-        region_to_group[rid] = gid
-        group_members[gid].append(rid)
-
-    num_groups = next_group
+    center_candidates = np.ones(num_regions, dtype=bool)
+    center_candidates[border_region] = False
+    if lead_region >= 0:
+        center_candidates[lead_region] = False
+    if center_candidates.any():
+        center_region = int(np.argmin(np.where(center_candidates, r, np.inf)))
+    else:
+        center_region = -1
+
+    # Special regions get their own groups (0..num_special-1)
+    specials = [rid for rid in (border_region, lead_region, center_region) if rid >= 0]
+    num_special = len(specials)
+    group_of = np.empty(num_regions, dtype=np.int64)
+    is_special = np.zeros(num_regions, dtype=bool)
+    for gid, rid in enumerate(specials):
+        group_of[rid] = gid
+        is_special[rid] = True
+
+    # Group remaining regions by (r_bin, t_bin), numbering groups in order
+    # of their lowest member region
+    rest = np.flatnonzero(~is_special)
+    bin_keys = r_bin[rest] * (t_bins + 2) + t_bin[rest]
+    _, first_index, bin_inverse = np.unique(
+        bin_keys, return_index=True, return_inverse=True
+    )
+    bin_rank = np.empty(first_index.size, dtype=np.int64)
+    bin_rank[np.argsort(first_index)] = np.arange(first_index.size)
+    group_of[rest] = num_special + bin_rank[bin_inverse]
+
+    num_groups = num_special + first_index.size
 
     # Compute group centroids (average r and theta of members)
     group_r = np.zeros(num_groups)
     group_t = np.zeros(num_groups)
-    for gid, members in group_members.items():
-        group_r[gid] = np.mean([r_norm[m] for m in members])
-        group_t[gid] = np.mean([theta_folded_norm[m] for m in members])
-
-    # Build group adjacency
-    group_adj: list[set[int]] = [set() for _ in range(num_groups)]
-    for rid in range(num_regions):
-        gid = region_to_group[rid]
-        for neighbor in adj[rid]:
-            ngid = region_to_group[neighbor]
-            if ngid != gid:
-                group_adj[gid].add(ngid)
+    if rest.size:
+        member_groups = group_of[rest]
+        member_counts = np.bincount(member_groups, minlength=num_groups)
+        member_counts = np.maximum(member_counts, 1)
+        group_r = np.bincount(member_groups, r_norm[rest], num_groups) / member_counts
+        group_t = (
+            np.bincount(member_groups, theta_folded_norm[rest], num_groups)
+            / member_counts
+        )
+    for gid, rid in enumerate(specials):
+        group_r[gid] = r_norm[rid]
+        group_t[gid] = theta_folded_norm[rid]
+
+    # Build group adjacency by mapping every region edge to its groups
+    edge_groups = group_of[np.repeat(np.arange(num_regions), degrees)]
+    neighbor_groups = group_of[adj_indices]
+    cross = edge_groups != neighbor_groups
+    group_keys = np.unique(edge_groups[cross] * num_groups + neighbor_groups[cross])
+    group_indptr = np.zeros(num_groups + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(group_keys // num_groups, minlength=num_groups),
+        out=group_indptr[1:],
+    )
+    group_indices = group_keys % num_groups
 
     # Sort groups by (radius, angle) for radial color cycling
-    group_order = sorted(
-        range(num_groups),
-        key=lambda g: (round(group_r[g] * 5), group_t[g]),
-    )
+    group_order = np.lexsort((group_t, np.round(group_r * 5)))
 
     # Assign colors to groups, cycling through palette by radius
-    group_colors = [-1] * num_groups
-    color_cursor = 0
-
-    for gid in group_order:
-        used = {group_colors[ng] for ng in group_adj[gid] if group_colors[ng] >= 0}
-
-        # Try the next cursor color first (for visual cycling pattern)
-        if color_cursor % num_colors not in used:
-            group_colors[gid] = color_cursor % num_colors
-        else:
-            # Find nearest available color to cursor position
-            for offset in range(num_colors):
-                candidate = (color_cursor + offset) % num_colors
-                if candidate not in used:
-                    group_colors[gid] = candidate
-                    break
-            else:
-                # All colors conflict; pick the cursor color anyway
-                group_colors[gid] = color_cursor % num_colors
-
-        color_cursor += 1
+    group_colors = _color_groups(group_order, group_indptr, group_indices, num_colors)
 
     # Map group colors back to individual regions
-    colors = [0] * num_regions
-    for rid in range(num_regions):
-        gid = region_to_group[rid]
-        colors[rid] = group_colors[gid]
-
-    return colors
+    return group_colors[group_of].tolist()
 
 
 def export_puzzle(
@@ -301,8 +404,11 @@ def export_puzzle(
     else:
         palette = list(palette)
 
-    # Assign colors to regions
-    region_colors = assign_region_colors(puzzle, num_colors, puzzle.region_ids)
+    # Assign colors to regions (the adjacency is reused below)
+    adjacency = _build_adjacency(puzzle.region_ids, puzzle.num_regions)
+    region_colors = assign_region_colors(
+        puzzle, num_colors, puzzle.region_ids, adjacency=adjacency
+    )
 
     # Create palette with numbers
     palette_data = []
@@ -313,7 +419,6 @@ def export_puzzle(
         })
 
     # Identify non-playable regions (border + structural framework)
-    num_regions = puzzle.num_regions
     region_ids = puzzle.region_ids
     non_playable: list[int] = []
 
@@ -322,11 +427,8 @@ def export_puzzle(
     non_playable.append(border_region)
 
     # Structural "framework" regions (e.g. stained glass lead lines)
-    adj = _build_adjacency(region_ids, num_regions)
-    half = num_regions / 2.0
-    for rid in range(num_regions):
-        if rid != border_region and len(adj[rid]) > half:
-            non_playable.append(rid)
+    framework = _framework_regions(np.diff(adjacency[0]))
+    non_playable.extend(framework[framework != border_region].tolist())
 
     # Create puzzle.json
     puzzle_json = {
@@ -342,19 +444,19 @@ def export_puzzle(
         },
     }
 
-    with open(output_dir / "puzzle.json", "w", encoding="utf-8") as f:
-        json.dump(puzzle_json, f, indent=2)
+    with open(output_dir / "puzzle.json", "wb") as f:
+        f.write(_dumps_json(puzzle_json))
 
     # Create region_ids.png
     # Encoding: id = r + (g << 8) + (b << 16)
-    region_ids = puzzle.region_ids.astype(np.uint32)
-    r = (region_ids & 0xFF).astype(np.uint8)
-    g = ((region_ids >> 8) & 0xFF).astype(np.uint8)
-    b = ((region_ids >> 16) & 0xFF).astype(np.uint8)
-
-    rgb = np.stack([r, g, b], axis=-1)
+    # Little-endian uint32 bytes are already (r, g, b, 0) per pixel
+    region_ids_le = np.ascontiguousarray(puzzle.region_ids, dtype="<u4")
+    rgb = np.ascontiguousarray(
+        region_ids_le.view(np.uint8).reshape(region_ids_le.shape + (4,))[..., :3]
+    )
     img = Image.fromarray(rgb, mode="RGB")
-    img.save(output_dir / "region_ids.png")
+    # Region IDs are long flat runs, so fast zlib still compresses them well
+    img.save(output_dir / "region_ids.png", compress_level=1)
 
     print(f"Exported puzzle to {output_dir}")
     print(f"  Size: {puzzle.width}x{puzzle.height}")
@@ -382,3 +484,62 @@ def create_puzzle(
     puzzle = generator.generate()
     export_puzzle(puzzle, output_dir, num_colors, palette=palette)
     return puzzle
+
+
+def _init_puzzle_worker() -> None:
+    """Limit each pool worker to one Numba thread to avoid oversubscription."""
+    try:
+        import numba
+    except ImportError:
+        return
+    numba.set_num_threads(1)
+
+
+def create_puzzles(
+    generators: Sequence[BaseGenerator],
+    output_dirs: Sequence[Path],
+    num_colors: int = 6,
+    palette: Sequence[tuple[int, int, int]] | None = None,
+    max_workers: int | None = None,
+) -> list[GeneratedPuzzle]:
+    """Generate and export several puzzles in parallel worker processes.
+
+    Each (generator, output_dir) pair is independent, so they are spread
+    across a process pool. Results are identical to calling create_puzzle
+    on each pair in turn.
+
+    Args:
+        generators: Initialized generators to use.
+        output_dirs: Output directory for each generator.
+        num_colors: Number of colors in palette.
+        palette: Optional custom palette (RGB tuples), shared by all puzzles.
+        max_workers: Worker process count (default: CPU count).
+
+    Returns:
+        The generated puzzles, in the same order as generators.
+
+    Raises:
+        ValueError: If generators and output_dirs differ in length.
+    """
+    if len(generators) != len(output_dirs):
+        raise ValueError(
+            f"Got {len(generators)} generators but {len(output_dirs)} output dirs"
+        )
+
+    if palette is not None:
+        palette = list(palette)
+
+    if len(generators) <= 1 or max_workers == 1:
+        return [
+            create_puzzle(generator, output_dir, num_colors, palette=palette)
+            for generator, output_dir in zip(generators, output_dirs)
+        ]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_puzzle_worker
+    ) as pool:
+        futures = [
+            pool.submit(create_puzzle, generator, output_dir, num_colors, palette)
+            for generator, output_dir in zip(generators, output_dirs)
+        ]
+        return [future.result() for future in futures]
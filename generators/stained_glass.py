@@ -9,6 +9,11 @@ from dataclasses import dataclass
 
 import numpy as np
 
+try:
+    from scipy.ndimage import distance_transform_cdt
+except ImportError:  # scipy is optional; fall back to NumPy shifts
+    distance_transform_cdt = None
+
 from .base import BaseGenerator, GeneratorParams, GeneratedPuzzle
 
 
@@ -92,7 +97,7 @@ class StainedGlassGenerator(BaseGenerator):
 
     def _generate_symmetric_points(
         self, cx: float, cy: float, radius: float
-    ) -> list[tuple[float, float]]:
+    ) -> np.ndarray:
         """Generate points with radial symmetry.
 
         Args:
@@ -101,45 +106,45 @@ class StainedGlassGenerator(BaseGenerator):
             radius: Mandala radius.
 
         Returns:
-            List of (x, y) point coordinates.
+            (N, 2) float64 array of (x, y) point coordinates.
         """
-        points = []
         slices = self.params.symmetry_slices
         wedge_angle = 2 * math.pi / slices
         point_count = self.sg_params.point_count
         edge_boost = self.sg_params.edge_detail_boost
 
-        # Generate points in the first wedge
-        wedge_points = []
+        # Random (angle within wedge, radius) pairs for the first wedge,
+        # drawn in the same interleaved order as one point at a time
         points_per_wedge = max(1, point_count // slices)
-
-        for _ in range(points_per_wedge):
-            angle = self.rng.uniform(0, wedge_angle)
-
-            # Random radius with edge bias
-            r = self.rng.random()
-            if edge_boost > 0:
-                # Bias toward edge
-                r = r ** (1 - edge_boost * 0.7)
-            r = r * radius * 0.9
-
-            px = r * math.cos(angle)
-            py = r * math.sin(angle)
-            wedge_points.append((px, py))
-
-        # Rotate-copy to all slices
-        for i in range(slices):
-            rot_angle = i * wedge_angle
-            cos_a = math.cos(rot_angle)
-            sin_a = math.sin(rot_angle)
-
-            for px, py in wedge_points:
-                rx = px * cos_a - py * sin_a + cx
-                ry = px * sin_a + py * cos_a + cy
-                points.append((rx, ry))
+        draws = np.array(
+            [
+                (self.rng.uniform(0, wedge_angle), self.rng.random())
+                for _ in range(points_per_wedge)
+            ],
+            dtype=np.float64,
+        )
+        angles = draws[:, 0]
+        r = draws[:, 1]
+
+        # Random radius with edge bias
+        if edge_boost > 0:
+            # Bias toward edge
+            r = r ** (1 - edge_boost * 0.7)
+        r = r * radius * 0.9
+
+        px = r * np.cos(angles)
+        py = r * np.sin(angles)
+
+        # Rotate-copy to all slices: one row of rotated points per slice
+        rot_angles = np.arange(slices)[:, None] * wedge_angle
+        cos_a = np.cos(rot_angles)
+        sin_a = np.sin(rot_angles)
+        points = np.empty((slices * px.size + 1, 2), dtype=np.float64)
+        points[:-1, 0] = (px * cos_a - py * sin_a + cx).ravel()
+        points[:-1, 1] = (px * sin_a + py * cos_a + cy).ravel()
 
         # Add center point
-        points.append((cx, cy))
+        points[-1] = (cx, cy)
 
         return points
 
@@ -179,34 +184,6 @@ class StainedGlassGenerator(BaseGenerator):
 
         return points
 
-    def _compute_voronoi(
-        self, points: list[tuple[float, float]], width: int, height: int
-    ) -> np.ndarray:
-        """Compute Voronoi diagram.
-
-        Args:
-            points: List of seed points.
-            width: Image width.
-            height: Image height.
-
-        Returns:
-            Region ID array.
-        """
-        y_coords, x_coords = np.ogrid[:height, :width]
-        y_grid = y_coords.astype(np.float32)
-        x_grid = x_coords.astype(np.float32)
-
-        min_dist = np.full((height, width), np.inf, dtype=np.float32)
-        region_ids = np.zeros((height, width), dtype=np.int32)
-
-        for i, (px, py) in enumerate(points):
-            dist = (x_grid - px) ** 2 + (y_grid - py) ** 2
-            closer = dist < min_dist
-            min_dist[closer] = dist[closer]
-            region_ids[closer] = i
-
-        return region_ids
-
     def _add_lead_outlines(self, region_ids: np.ndarray) -> np.ndarray:
         """Add thick "lead" outlines between regions.
 
@@ -219,19 +196,29 @@ class StainedGlassGenerator(BaseGenerator):
         thickness = self.sg_params.outline_thickness
         height, width = region_ids.shape
 
-        # Find boundary pixels
+        # Find boundary pixels: both sides of every differing neighbor pair,
+        # comparing each pair once per axis
         boundary = np.zeros((height, width), dtype=bool)
 
         # Check horizontal neighbors
-        boundary[:, :-1] |= region_ids[:, :-1] != region_ids[:, 1:]
-        boundary[:, 1:] |= region_ids[:, :-1] != region_ids[:, 1:]
+        diff = region_ids[:, :-1] != region_ids[:, 1:]
+        boundary[:, :-1] = diff
+        boundary[:, 1:] |= diff
 
         # Check vertical neighbors
-        boundary[:-1, :] |= region_ids[:-1, :] != region_ids[1:, :]
-        boundary[1:, :] |= region_ids[:-1, :] != region_ids[1:, :]
-
-        # Dilate boundary to create thick outlines
-        if thickness > 1:
+        diff = region_ids[:-1, :] != region_ids[1:, :]
+        boundary[:-1, :] |= diff
+        boundary[1:, :] |= diff
+
+        # Dilate boundary to create thick outlines: thickness - 1 steps of
+        # 4-connected growth, i.e. every pixel within that taxicab distance.
+        # The distance transform does it in one pass for any thickness
+        # (it reports -1 everywhere when there is no boundary at all).
+        if thickness > 1 and distance_transform_cdt is not None:
+            if boundary.any():
+                dist = distance_transform_cdt(~boundary, metric="taxicab")
+                boundary = dist <= thickness - 1
+        elif thickness > 1:
             dilated = boundary.copy()
             for _ in range(thickness - 1):
                 new_dilated = dilated.copy()
@@ -244,7 +231,7 @@ class StainedGlassGenerator(BaseGenerator):
 
         # Mark lead as the highest region ID
         lead_id = int(np.max(region_ids)) + 1
-        result = region_ids.copy()
+        result = self._copy_for_new_id(region_ids, lead_id)
         result[boundary] = lead_id
 
         return result
@@ -10,6 +10,7 @@ from dataclasses import dataclass
 import numpy as np
 
 from .base import BaseGenerator, GeneratorParams, GeneratedPuzzle
+from .cleanup import region_moments
 
 
 @dataclass
@@ -91,7 +92,7 @@ class VoronoiMandalaGenerator(BaseGenerator):
 
     def _generate_symmetric_points(
         self, cx: float, cy: float, radius: float
-    ) -> list[tuple[float, float]]:
+    ) -> np.ndarray:
         """Generate points with radial symmetry.
 
         Args:
@@ -100,122 +101,85 @@ class VoronoiMandalaGenerator(BaseGenerator):
             radius: Mandala radius.
 
         Returns:
-            List of (x, y) point coordinates.
+            (N, 2) float64 array of (x, y) point coordinates.
         """
-        points = []
         slices = self.params.symmetry_slices
         wedge_angle = 2 * math.pi / slices
         point_count = self.vm_params.point_count
         bias = self.vm_params.radial_bias
 
-        # Generate points in the first wedge
-        wedge_points = []
-        for _ in range(point_count):
-            # Random angle within wedge
-            angle = self.rng.uniform(0, wedge_angle)
-
-            # Random radius with bias toward edge
-            r = self.rng.random()
-            if bias > 0:
-                r = r ** (1 - bias * 0.8)  # Power transform for edge bias
-            r = r * radius * 0.95  # Keep points slightly inside edge
-
-            # Convert to cartesian (relative to center)
-            px = r * math.cos(angle)
-            py = r * math.sin(angle)
-            wedge_points.append((px, py))
-
-        # Rotate-copy to all slices
-        for i in range(slices):
-            rot_angle = i * wedge_angle
-            cos_a = math.cos(rot_angle)
-            sin_a = math.sin(rot_angle)
-
-            for px, py in wedge_points:
-                rx = px * cos_a - py * sin_a + cx
-                ry = px * sin_a + py * cos_a + cy
-                points.append((rx, ry))
+        # Random (angle within wedge, radius) pairs for the first wedge,
+        # drawn in the same interleaved order as one point at a time
+        draws = np.array(
+            [
+                (self.rng.uniform(0, wedge_angle), self.rng.random())
+                for _ in range(point_count)
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        angles = draws[:, 0]
+        r = draws[:, 1]
+
+        # Random radius with bias toward edge
+        if bias > 0:
+            r = r ** (1 - bias * 0.8)  # Power transform for edge bias
+        r = r * radius * 0.95  # Keep points slightly inside edge
+
+        # Convert to cartesian (relative to center)
+        px = r * np.cos(angles)
+        py = r * np.sin(angles)
+
+        # Rotate-copy to all slices: one row of rotated points per slice
+        rot_angles = np.arange(slices)[:, None] * wedge_angle
+        cos_a = np.cos(rot_angles)
+        sin_a = np.sin(rot_angles)
+        points = np.empty((slices * px.size + 1, 2), dtype=np.float64)
+        points[:-1, 0] = (px * cos_a - py * sin_a + cx).ravel()
+        points[:-1, 1] = (px * sin_a + py * cos_a + cy).ravel()
 
         # Add center point
-        points.append((cx, cy))
+        points[-1] = (cx, cy)
 
         return points
 
-    def _compute_voronoi(
-        self, points: list[tuple[float, float]], width: int, height: int
-    ) -> np.ndarray:
-        """Compute Voronoi diagram by assigning each pixel to nearest point.
-
-        Args:
-            points: List of seed points.
-            width: Image width.
-            height: Image height.
-
-        Returns:
-            Region ID array where each pixel is assigned to nearest point.
-        """
-        # Create coordinate grids
-        y_coords, x_coords = np.ogrid[:height, :width]
-        y_grid = y_coords.astype(np.float32)
-        x_grid = x_coords.astype(np.float32)
-
-        # Initialize with large distances
-        min_dist = np.full((height, width), np.inf, dtype=np.float32)
-        region_ids = np.zeros((height, width), dtype=np.int32)
-
-        # Assign each pixel to nearest point
-        for i, (px, py) in enumerate(points):
-            dist = (x_grid - px) ** 2 + (y_grid - py) ** 2
-            closer = dist < min_dist
-            min_dist[closer] = dist[closer]
-            region_ids[closer] = i
-
-        return region_ids
-
     def _lloyd_relax(
         self,
         region_ids: np.ndarray,
-        points: list[tuple[float, float]],
+        points: np.ndarray,
         cx: float,
         cy: float,
         radius: float,
-    ) -> list[tuple[float, float]]:
+    ) -> np.ndarray:
         """Apply one iteration of Lloyd relaxation.
 
         Moves each point to the centroid of its Voronoi cell.
 
         Args:
             region_ids: Current Voronoi diagram.
-            points: Current point positions.
+            points: Current (N, 2) point positions.
             cx: Center X for boundary clamping.
             cy: Center Y for boundary clamping.
             radius: Radius for boundary clamping.
 
         Returns:
-            Updated point positions.
+            Updated (N, 2) point positions.
         """
-        height, width = region_ids.shape
-        new_points = []
-
-        for i in range(len(points)):
-            mask = region_ids == i
-            if not np.any(mask):
-                new_points.append(points[i])
-                continue
-
-            # Compute centroid
-            y_coords, x_coords = np.where(mask)
-            new_x = float(np.mean(x_coords))
-            new_y = float(np.mean(y_coords))
-
-            # Clamp to circle
-            dx, dy = new_x - cx, new_y - cy
-            dist = math.sqrt(dx * dx + dy * dy)
-            if dist > radius * 0.95:
-                scale = radius * 0.95 / dist
-                new_x = cx + dx * scale
-                new_y = cy + dy * scale
-
-            new_points.append((new_x, new_y))
-
-        return new_points
+        # All cell centroids from one pass of per-region coordinate sums
+        num_points = len(points)
+        counts, sum_x, sum_y = region_moments(region_ids, num_points)
+        old = np.asarray(points, dtype=np.float64).reshape(num_points, 2)
+        occupied = counts > 0
+        safe_counts = np.maximum(counts, 1.0)
+        new_x = np.where(occupied, sum_x / safe_counts, old[:, 0])
+        new_y = np.where(occupied, sum_y / safe_counts, old[:, 1])
+
+        # Clamp moved points to the circle (empty cells keep their point)
+        dx, dy = new_x - cx, new_y - cy
+        dist = np.sqrt(dx * dx + dy * dy)
+        limit = radius * 0.95
+        outside = occupied & (dist > limit)
+        scale = limit / np.where(outside, dist, 1.0)
+        new_x = np.where(outside, cx + dx * scale, new_x)
+        new_y = np.where(outside, cy + dy * scale, new_y)
+
+        return np.column_stack((new_x, new_y))
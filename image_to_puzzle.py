@@ -20,6 +20,10 @@ from scipy.spatial import cKDTree
 
 from generators.cleanup import cleanup_regions
 
+# Up to this many seeds, subdivide_regions finds nearest seeds by direct
+# distance comparison instead of building a KD-tree
+_BRUTE_FORCE_MAX_SEEDS = 8
+
 
 def load_and_resize(path: str, max_edge: int) -> Image.Image:
     """Load an image and resize so the longest edge equals max_edge.
@@ -41,7 +45,7 @@ def load_and_resize(path: str, max_edge: int) -> Image.Image:
 
 def quantize_image(
     img: Image.Image, num_colors: int, blur_radius: float
-) -> tuple[Image.Image, list[tuple[int, int, int]]]:
+) -> tuple[list[tuple[int, int, int]], np.ndarray]:
     """Quantize an image to a fixed number of colors.
 
     Args:
@@ -50,13 +54,20 @@ def quantize_image(
         blur_radius: Gaussian blur radius applied before quantization (0 to skip).
 
     Returns:
-        Tuple of (quantized RGB image, list of palette RGB tuples).
+        Tuple of (list of palette RGB tuples, HxW uint8 palette index per
+        pixel).
     """
     if blur_radius > 0:
         img = img.filter(ImageFilter.GaussianBlur(radius=blur_radius))
 
-    # Quantize to palette
-    quantized = img.quantize(colors=num_colors, method=Image.Quantize.MEDIANCUT)
+    # Quantize to palette. Fast octree is much quicker than median cut.
+    # Pillow only applies dither= when remapping to a given palette, so it
+    # has no effect here and is passed just to make the intent explicit.
+    quantized = img.quantize(
+        colors=num_colors,
+        method=Image.Quantize.FASTOCTREE,
+        dither=Image.Dither.NONE,
+    )
 
     # Extract the palette colors
     raw_palette = quantized.getpalette()  # flat [r,g,b, r,g,b, ...]
@@ -65,88 +76,75 @@ def quantize_image(
         r, g, b = raw_palette[i * 3 : i * 3 + 3]
         palette.append((r, g, b))
 
-    # Convert back to RGB for pixel access
-    quantized_rgb = quantized.convert("RGB")
-    return quantized_rgb, palette
+    # The palettized image already holds each pixel's palette index. Map
+    # duplicate palette entries to their first occurrence, so equal colors
+    # always share one index.
+    palette_arr = np.array(palette, dtype=np.uint8)
+    first_match = np.all(palette_arr[:, None, :] == palette_arr[None, :, :], axis=2)
+    canonical = np.argmax(first_match, axis=1).astype(np.uint8)
+    color_index_map = canonical[np.asarray(quantized, dtype=np.uint8)]
+
+    return palette, color_index_map
 
 
 def build_region_ids(
-    quantized_rgb: Image.Image,
+    color_index_map: np.ndarray,
     palette: list[tuple[int, int, int]],
 ) -> np.ndarray:
     """Label connected components of same-color pixels.
 
     Args:
-        quantized_rgb: Quantized RGB image.
+        color_index_map: HxW palette index per pixel (from quantize_image).
         palette: List of palette colors.
 
     Returns:
         2D int array where each pixel has a unique region ID.
     """
-    arr = np.array(quantized_rgb, dtype=np.uint8)
-    h, w = arr.shape[:2]
-
-    # Map each pixel to its palette index
-    palette_arr = np.array(palette, dtype=np.uint8)  # (num_colors, 3)
-    # Compute color index per pixel by matching against palette
-    pixel_colors = arr.reshape(-1, 3)  # (h*w, 3)
-    # Broadcast comparison: (h*w, 1, 3) == (1, num_colors, 3) -> all match
-    matches = np.all(
-        pixel_colors[:, np.newaxis, :] == palette_arr[np.newaxis, :, :],
-        axis=2,
-    )  # (h*w, num_colors)
-    color_index_map = np.argmax(matches, axis=1).reshape(h, w)
-
-    # Label connected components per color
+    h, w = color_index_map.shape
+
+    # Label connected components per color, visiting only colors present
     region_ids = np.zeros((h, w), dtype=np.int32)
+    labels = np.empty((h, w), dtype=np.int32)  # reused label() output
     next_id = 0
     structure = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]])  # 4-connected
+    color_counts = np.bincount(color_index_map.ravel(), minlength=len(palette))
 
-    for color_idx in range(len(palette)):
+    for color_idx in np.flatnonzero(color_counts).tolist():
         mask = color_index_map == color_idx
-        if not np.any(mask):
-            continue
-        labels, num_features = label(mask, structure=structure)
-        # Assign globally unique IDs (skip label 0 which is background)
-        for lbl in range(1, num_features + 1):
-            region_ids[labels == lbl] = next_id
-            next_id += 1
+        num_features = label(mask, structure=structure, output=labels)
+        # Labels are 1..num_features in scan order, so shift them into the
+        # next block of globally unique IDs in one masked write
+        region_ids[mask] = labels[mask] + (next_id - 1)
+        next_id += num_features
 
     return region_ids
 
 
 def build_region_color_map(
     region_ids: np.ndarray,
-    quantized_rgb: Image.Image,
+    color_index_map: np.ndarray,
     palette: list[tuple[int, int, int]],
 ) -> list[int]:
     """Map each region to its dominant palette color index.
 
     Args:
         region_ids: Region ID map after cleanup.
-        quantized_rgb: Quantized RGB image.
+        color_index_map: HxW palette index per pixel from quantize_image.
         palette: List of palette colors.
 
     Returns:
         List where region_color[region_id] = palette_index.
     """
-    arr = np.array(quantized_rgb, dtype=np.uint8)
     num_regions = int(np.max(region_ids)) + 1
-    palette_arr = np.array(palette, dtype=np.uint8)
-
-    region_color = [0] * num_regions
-    for rid in range(num_regions):
-        mask = region_ids == rid
-        if not np.any(mask):
-            continue
-        # Sample the dominant color from region pixels
-        pixels = arr[mask]  # (N, 3)
-        # Find mean color, then match to nearest palette entry
-        mean_color = pixels.mean(axis=0)
-        dists = np.sum((palette_arr.astype(float) - mean_color) ** 2, axis=1)
-        region_color[rid] = int(np.argmin(dists))
+    num_colors = len(palette)
 
-    return region_color
+    # Histogram of palette indices per region from one bincount over
+    # (region, color) pairs; the most common index wins (ties and empty
+    # IDs go to the lowest index)
+    keys = region_ids.ravel().astype(np.intp) * num_colors
+    keys += color_index_map.ravel()
+    hist = np.bincount(keys, minlength=num_regions * num_colors)
+    return hist.reshape(num_regions, num_colors).argmax(axis=1).tolist()
 
 
 def subdivide_regions(
@@ -179,6 +177,12 @@ def subdivide_regions(
     result = region_ids.copy()
     next_id = num_regions
 
+    # Group pixel indices by region once: a stable sort keeps each region's
+    # pixels in row-major order, so each region is a contiguous slice
+    order = np.argsort(region_ids.ravel(), kind="stable")
+    ends = np.cumsum(areas)
+    starts = ends - areas
+
     for rid in range(num_regions):
         area = int(areas[rid])
         if area <= target_area * 1.5:
@@ -188,27 +192,26 @@ def subdivide_regions(
         num_splits = max(2, round(area / target_area))
 
         # Get all pixel coordinates for this region
-        ys, xs = np.nonzero(region_ids == rid)
+        pix_idx = order[starts[rid]:ends[rid]]
+        ys, xs = np.unravel_index(pix_idx, (h, w))
         coords = np.column_stack([xs, ys])  # (N, 2) as (x, y)
 
         # Pick random seed points from within the region
         seed_indices = rng.choice(len(coords), size=num_splits, replace=False)
         seeds = coords[seed_indices].astype(np.float64)
 
-        # Assign each pixel to nearest seed
-        tree = cKDTree(seeds)
-        _, labels = tree.query(coords)
-
-        # Write new IDs (first sub-region keeps original ID, rest get new ones)
-        for sub_idx in range(num_splits):
-            sub_mask = labels == sub_idx
-            if sub_idx == 0:
-                # Keep original rid
-                pass
-            else:
-                sub_pixels = coords[sub_mask]
-                result[sub_pixels[:, 1], sub_pixels[:, 0]] = next_id
-                next_id += 1
+        # Assign each pixel to nearest seed: a few seeds are cheaper to
+        # compare directly than to build a tree for
+        if num_splits <= _BRUTE_FORCE_MAX_SEEDS:
+            diff = coords[:, None, :] - seeds[None, :, :]
+            labels = np.argmin((diff * diff).sum(axis=-1), axis=1)
+        else:
+            _, labels = cKDTree(seeds).query(coords, workers=-1)
+
+        # Write new IDs in one scatter (first sub-region keeps original ID,
+        # rest get consecutive new ones)
+        result.flat[pix_idx] = np.where(labels == 0, rid, next_id + labels - 1)
+        next_id += num_splits - 1
 
     return result
 
@@ -258,14 +261,14 @@ def export_image_puzzle(
     with open(output_dir / "puzzle.json", "w", encoding="utf-8") as f:
         json.dump(puzzle_json, f, indent=2)
 
-    # Encode region_ids.png: id = r + (g << 8) + (b << 16)
-    ids = region_ids.astype(np.uint32)
-    r = (ids & 0xFF).astype(np.uint8)
-    g = ((ids >> 8) & 0xFF).astype(np.uint8)
-    b = ((ids >> 16) & 0xFF).astype(np.uint8)
-    rgb = np.stack([r, g, b], axis=-1)
-    img = Image.fromarray(rgb)
-    img.save(output_dir / "region_ids.png")
+    # Encode region_ids.png: id = r + (g << 8) + (b << 16), so IDs must
+    # fit in 24 bits. Little-endian uint32 bytes are already (r, g, b, 0)
+    # per pixel
+    ids = np.ascontiguousarray(region_ids, dtype="<u4")
+    rgb = np.ascontiguousarray(ids.view(np.uint8).reshape(h, w, 4)[..., :3])
+    img = Image.fromarray(rgb, mode="RGB")
+    # Region IDs are long flat runs, so fast zlib still compresses them well
+    img.save(output_dir / "region_ids.png", compress_level=1)
 
     print(f"Exported image puzzle to {output_dir}")
     print(f"  Source: {os.path.basename(source_path)}")
@@ -335,10 +338,10 @@ def main() -> None:
     print(f"  Resized to {img.size[0]}x{img.size[1]}")
 
     print(f"Quantizing to {args.colors} colors...")
-    quantized_rgb, palette = quantize_image(img, args.colors, args.blur)
+    palette, color_index_map = quantize_image(img, args.colors, args.blur)
 
     print("Labeling connected regions...")
-    region_ids = build_region_ids(quantized_rgb, palette)
+    region_ids = build_region_ids(color_index_map, palette)
     raw_regions = int(np.max(region_ids)) + 1
     print(f"  Found {raw_regions} raw regions")
 
@@ -358,7 +361,7 @@ def main() -> None:
         final_regions = clean_regions
 
     print("Assigning colors...")
-    region_color = build_region_color_map(region_ids, quantized_rgb, palette)
+    region_color = build_region_color_map(region_ids, color_index_map, palette)
 
     export_image_puzzle(
         region_ids, palette, region_color, args.output_dir, args.image_path
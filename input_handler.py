@@ -1,5 +1,7 @@
 """Gamepad input handling for BusyBrainPaint."""
 
+import math
+
 import pygame
 
 
@@ -27,6 +29,48 @@ AXIS_RT = 5
 HAT_INDEX = 0
 
 
+def _axis_deadzone(value: float, deadzone: float, inv_range: float) -> float:
+    """Apply deadzone to an axis value.
+
+    Args:
+        value: Raw axis value (-1 to 1).
+        deadzone: Deadzone threshold.
+        inv_range: Precomputed 1 / (1 - deadzone).
+
+    Returns:
+        Processed value with deadzone applied.
+    """
+    magnitude = abs(value)
+    if magnitude < deadzone:
+        return 0.0
+    # Remap to full range outside deadzone, keeping the sign
+    return math.copysign((magnitude - deadzone) * inv_range, value)
+
+
+def _stick_deadzone(
+    x: float, y: float, deadzone: float, inv_range: float
+) -> tuple[float, float]:
+    """Apply circular deadzone to stick input.
+
+    Args:
+        x: Raw X axis value.
+        y: Raw Y axis value.
+        deadzone: Deadzone radius.
+        inv_range: Precomputed 1 / (1 - deadzone).
+
+    Returns:
+        Processed (x, y) with circular deadzone applied.
+    """
+    magnitude = math.sqrt(x * x + y * y)
+    if magnitude < deadzone:
+        return (0.0, 0.0)
+
+    # Normalize and remap
+    scale = (magnitude - deadzone) * inv_range
+    scale = min(scale, 1.0)  # Clamp to 1.0
+    return (x / magnitude * scale, y / magnitude * scale)
+
+
 class InputState:
     """Current state of gamepad inputs."""
 
@@ -43,12 +87,12 @@ class InputState:
         # D-pad (raw hat values)
         self.dpad: tuple[int, int] = (0, 0)
 
-        # Buttons (current frame)
-        self.buttons: dict[int, bool] = {}
+        # Buttons (current frame), as a bitmask: bit b set if button b is held
+        self.buttons: int = 0
 
-        # Button events (just pressed this frame)
-        self.buttons_pressed: set[int] = set()
-        self.buttons_released: set[int] = set()
+        # Button events (just pressed/released this frame), as bitmasks
+        self.buttons_pressed: int = 0
+        self.buttons_released: int = 0
 
         # D-pad events (just pressed this frame)
         self.dpad_pressed: tuple[int, int] | None = None
@@ -57,19 +101,37 @@ class InputState:
 class InputHandler:
     """Handles gamepad input with deadzone and event detection."""
 
-    def __init__(self, stick_deadzone: float = 0.2, trigger_deadzone: float = 0.1) -> None:
+    def __init__(
+        self,
+        stick_deadzone: float = 0.2,
+        trigger_deadzone: float = 0.1,
+        max_poll_hz: int = 60,
+    ) -> None:
         """Initialize input handler.
 
         Args:
             stick_deadzone: Deadzone for analog sticks.
             trigger_deadzone: Deadzone for triggers.
+            max_poll_hz: Most SDL event pumps per second (the display rate);
+                polls in between reuse the previous pump's state.
         """
         self.stick_deadzone = stick_deadzone
         self.trigger_deadzone = trigger_deadzone
 
+        # Reciprocals of the live range outside each deadzone
+        self._stick_inv_range = 1.0 / (1.0 - stick_deadzone)
+        self._trigger_inv_range = 1.0 / (1.0 - trigger_deadzone)
+
+        # Event pump rate limiting
+        self._pump_period_ms = 1000 // max_poll_hz
+        self._last_pump_ms: int | None = None
+        self._pumped_since_update = False
+
         self.joystick: pygame.joystick.JoystickType | None = None
+        self._num_buttons = 0
+        self._has_hat = False
         self.state = InputState()
-        self._prev_buttons: dict[int, bool] = {}
+        self._prev_buttons: int = 0
         self._prev_dpad: tuple[int, int] = (0, 0)
 
         self._init_joystick()
@@ -80,25 +142,26 @@ class InputHandler:
         if pygame.joystick.get_count() > 0:
             self.joystick = pygame.joystick.Joystick(0)
             self.joystick.init()
+
+            # Layout is fixed while connected; bind the per-frame readers once
+            self._get_axis = self.joystick.get_axis
+            self._get_button = self.joystick.get_button
+            self._num_buttons = self.joystick.get_numbuttons()
+            self._has_hat = self.joystick.get_numhats() > 0
             print(f"Gamepad connected: {self.joystick.get_name()}")
         else:
             print("No gamepad detected")
 
-    def _apply_deadzone(self, value: float, deadzone: float) -> float:
-        """Apply deadzone to an axis value.
+    def _apply_trigger_deadzone(self, value: float) -> float:
+        """Apply the trigger deadzone to an axis value.
 
         Args:
             value: Raw axis value (-1 to 1).
-            deadzone: Deadzone threshold.
 
         Returns:
             Processed value with deadzone applied.
         """
-        if abs(value) < deadzone:
-            return 0.0
-        # Remap to full range outside deadzone
-        sign = 1.0 if value > 0 else -1.0
-        return sign * (abs(value) - deadzone) / (1.0 - deadzone)
+        return _axis_deadzone(value, self.trigger_deadzone, self._trigger_inv_range)
 
     def _apply_stick_deadzone(self, x: float, y: float) -> tuple[float, float]:
         """Apply circular deadzone to stick input.
@@ -110,21 +173,37 @@ class InputHandler:
         Returns:
             Processed (x, y) with circular deadzone applied.
         """
-        magnitude = (x * x + y * y) ** 0.5
-        if magnitude < self.stick_deadzone:
-            return (0.0, 0.0)
+        return _stick_deadzone(x, y, self.stick_deadzone, self._stick_inv_range)
+
+    def poll_events(self) -> list[pygame.event.Event]:
+        """Pump SDL once and drain the event queue. Call once per frame.
+
+        The single pump also refreshes the joystick state that update()
+        reads, so a frame never pumps twice. Pumps are capped at
+        max_poll_hz; a poll sooner than that only drains queued events.
 
-        # Normalize and remap
-        scale = (magnitude - self.stick_deadzone) / (1.0 - self.stick_deadzone)
-        scale = min(scale, 1.0)  # Clamp to 1.0
-        return (x / magnitude * scale, y / magnitude * scale)
+        Returns:
+            All events queued since the last poll.
+        """
+        now = pygame.time.get_ticks()
+        if self._last_pump_ms is None or now - self._last_pump_ms >= self._pump_period_ms:
+            pygame.event.pump()
+            self._last_pump_ms = now
+            self._pumped_since_update = True
+        return pygame.event.get(pump=False)
 
     def update(self) -> None:
-        """Update input state. Call once per frame."""
-        self.state.buttons_pressed.clear()
-        self.state.buttons_released.clear()
+        """Update input state. Call once per frame, after poll_events()."""
+        self.state.buttons_pressed = 0
+        self.state.buttons_released = 0
         self.state.dpad_pressed = None
 
+        # No pump since the last update: joystick state is unchanged, so
+        # keep the cached sticks/buttons (no new press/release events)
+        if not self._pumped_since_update:
+            return
+        self._pumped_since_update = False
+
         if self.joystick is None:
             # Try to reconnect
             pygame.joystick.quit()
@@ -132,43 +211,46 @@ class InputHandler:
             if self.joystick is None:
                 return
 
-        # Read sticks
+        state = self.state
         try:
-            raw_lx = self.joystick.get_axis(AXIS_LEFT_X)
-            raw_ly = self.joystick.get_axis(AXIS_LEFT_Y)
-            self.state.left_stick = self._apply_stick_deadzone(raw_lx, raw_ly)
-
-            raw_rx = self.joystick.get_axis(AXIS_RIGHT_X)
-            raw_ry = self.joystick.get_axis(AXIS_RIGHT_Y)
-            self.state.right_stick = self._apply_stick_deadzone(raw_rx, raw_ry)
-
-            # Read triggers (some controllers report -1 to 1, normalize to 0 to 1)
-            raw_lt = self.joystick.get_axis(AXIS_LT)
-            raw_rt = self.joystick.get_axis(AXIS_RT)
-            self.state.lt = max(0.0, self._apply_deadzone((raw_lt + 1) / 2, self.trigger_deadzone))
-            self.state.rt = max(0.0, self._apply_deadzone((raw_rt + 1) / 2, self.trigger_deadzone))
+            # Read all axes in one pass, then process
+            get_axis = self._get_axis
+            raw_lx = get_axis(AXIS_LEFT_X)
+            raw_ly = get_axis(AXIS_LEFT_Y)
+            raw_rx = get_axis(AXIS_RIGHT_X)
+            raw_ry = get_axis(AXIS_RIGHT_Y)
+            raw_lt = get_axis(AXIS_LT)
+            raw_rt = get_axis(AXIS_RT)
+
+            # Sticks
+            state.left_stick = self._apply_stick_deadzone(raw_lx, raw_ly)
+            state.right_stick = self._apply_stick_deadzone(raw_rx, raw_ry)
+
+            # Triggers (some controllers report -1 to 1, normalize to 0 to 1)
+            state.lt = max(0.0, self._apply_trigger_deadzone((raw_lt + 1) / 2))
+            state.rt = max(0.0, self._apply_trigger_deadzone((raw_rt + 1) / 2))
 
             # Read D-pad
-            if self.joystick.get_numhats() > 0:
-                self.state.dpad = self.joystick.get_hat(HAT_INDEX)
+            if self._has_hat:
+                state.dpad = self.joystick.get_hat(HAT_INDEX)
 
                 # Detect D-pad press event
-                if self.state.dpad != (0, 0) and self._prev_dpad == (0, 0):
-                    self.state.dpad_pressed = self.state.dpad
-                self._prev_dpad = self.state.dpad
-
-            # Read buttons
-            for btn in range(self.joystick.get_numbuttons()):
-                pressed = self.joystick.get_button(btn)
-                self.state.buttons[btn] = pressed
-
-                was_pressed = self._prev_buttons.get(btn, False)
-                if pressed and not was_pressed:
-                    self.state.buttons_pressed.add(btn)
-                elif not pressed and was_pressed:
-                    self.state.buttons_released.add(btn)
-
-                self._prev_buttons[btn] = pressed
+                if state.dpad != (0, 0) and self._prev_dpad == (0, 0):
+                    state.dpad_pressed = state.dpad
+                self._prev_dpad = state.dpad
+
+            # Read buttons into a bitmask; edges fall out of mask algebra
+            get_button = self._get_button
+            buttons = 0
+            for btn in range(self._num_buttons):
+                if get_button(btn):
+                    buttons |= 1 << btn
+
+            prev_buttons = self._prev_buttons
+            state.buttons = buttons
+            state.buttons_pressed = buttons & ~prev_buttons
+            state.buttons_released = prev_buttons & ~buttons
+            self._prev_buttons = buttons
 
         except pygame.error:
             # Controller disconnected
@@ -184,7 +266,7 @@ class InputHandler:
         Returns:
             True if button was just pressed.
         """
-        return button in self.state.buttons_pressed
+        return bool(self.state.buttons_pressed >> button & 1)
 
     def is_button_held(self, button: int) -> bool:
         """Check if button is currently held.
@@ -195,7 +277,7 @@ class InputHandler:
         Returns:
             True if button is held.
         """
-        return self.state.buttons.get(button, False)
+        return bool(self.state.buttons >> button & 1)
 
     def is_button_released(self, button: int) -> bool:
         """Check if button was just released this frame.
@@ -206,4 +288,4 @@ class InputHandler:
         Returns:
             True if button was just released.
         """
-        return button in self.state.buttons_released
+        return bool(self.state.buttons_released >> button & 1)
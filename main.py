@@ -1,9 +1,11 @@
 """BusyBrainPaint - Paint-by-numbers mandala game."""
 
+import math
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pygame
 
 from camera import Camera
@@ -46,14 +48,47 @@ class GameRenderer:
         # Create surfaces
         self._create_surfaces()
 
+        # Scaled composite from the last frame, reused while its key
+        # (highlight, layer contents, fill preview, size) is unchanged.
+        # _layers_version is bumped whenever filled/temp surfaces change.
+        self._layers_version = 0
+        self._scaled_key: tuple | None = None
+        self._scaled: pygame.Surface | None = None
+
+        # Persistent unscaled composite, repainted only inside dirty rects:
+        # changed fills plus wherever the highlight/preview was or now is
+        self._composite_surface = self.base_surface.copy()
+        self._dirty_rects: list[pygame.Rect] = []
+        self._highlight_region = -1
+        self._highlight_rect: pygame.Rect | None = None
+        self._temp_rect: pygame.Rect | None = None
+        self._preview_rect: pygame.Rect | None = None
+
+        # UI fonts and text that never change, rendered once
+        self._palette_font = pygame.font.Font(None, 24)
+        self._info_font = pygame.font.Font(None, 28)
+        self._palette_number_surfs = [
+            self._palette_font.render(str(number), True, (0, 0, 0))
+            for number in puzzle.palette_numbers
+        ]
+        self._hint_surf = self._info_font.render(
+            "A: Fill | RStick: Navigate | DPad: Jump | LStick: Pan | Triggers: Zoom | LB/RB: Palette",
+            True,
+            (150, 150, 150),
+        )
+
     def _create_surfaces(self) -> None:
         """Create the rendering surfaces."""
         w, h = self.puzzle.width, self.puzzle.height
+        boundary = self._boundary_mask()
 
         # Base surface with outlines and unfilled regions
         self.base_surface = pygame.Surface((w, h))
         self.base_surface.fill(self.UNFILLED_COLOR)
-        self._draw_outlines(self.base_surface)
+        self._draw_outlines(self.base_surface, boundary)
+
+        # Edge pixels of each region, for drawing the selection highlight
+        self.region_edge_coords = self._build_region_edges(boundary)
 
         # Filled surface (starts empty/transparent)
         self.filled_surface = pygame.Surface((w, h), pygame.SRCALPHA)
@@ -64,28 +99,63 @@ class GameRenderer:
         # Highlight surface (redrawn each frame)
         self.highlight_surface = pygame.Surface((w, h), pygame.SRCALPHA)
 
-    def _draw_outlines(self, surface: pygame.Surface) -> None:
+    def _boundary_mask(self) -> np.ndarray:
+        """Find pixels with a 4-neighbor in a different region.
+
+        Returns:
+            HxW bool mask marking both pixels of every differing neighbor pair.
+        """
+        region_ids = self.puzzle.region_ids
+        mask = np.zeros(region_ids.shape, dtype=bool)
+
+        # Horizontal boundaries
+        diff = region_ids[:, :-1] != region_ids[:, 1:]
+        mask[:, :-1] = diff
+        mask[:, 1:] |= diff
+
+        # Vertical boundaries
+        diff = region_ids[:-1, :] != region_ids[1:, :]
+        mask[:-1, :] |= diff
+        mask[1:, :] |= diff
+
+        return mask
+
+    def _draw_outlines(self, surface: pygame.Surface, boundary: np.ndarray) -> None:
         """Draw region outlines on a surface.
 
         Args:
             surface: Surface to draw on.
+            boundary: HxW mask of outline pixels from _boundary_mask.
         """
-        region_ids = self.puzzle.region_ids
-        height, width = region_ids.shape
-
-        # Draw horizontal boundaries
-        for y in range(height):
-            for x in range(width - 1):
-                if region_ids[y, x] != region_ids[y, x + 1]:
-                    surface.set_at((x, y), self.OUTLINE_COLOR)
-                    surface.set_at((x + 1, y), self.OUTLINE_COLOR)
-
-        # Draw vertical boundaries
-        for y in range(height - 1):
-            for x in range(width):
-                if region_ids[y, x] != region_ids[y + 1, x]:
-                    surface.set_at((x, y), self.OUTLINE_COLOR)
-                    surface.set_at((x, y + 1), self.OUTLINE_COLOR)
+        # Write all outline pixels at once (surfarray is indexed [x, y])
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels.swapaxes(0, 1)[boundary] = self.OUTLINE_COLOR
+        del pixels  # Unlock the surface
+
+    def _build_region_edges(
+        self, boundary: np.ndarray
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Group every region's edge pixels for one-shot highlight writes.
+
+        A pixel is on its region's edge if it touches another region or the
+        image border.
+
+        Args:
+            boundary: HxW mask of outline pixels from _boundary_mask.
+
+        Returns:
+            List where region_edge_coords[region_id] = (xs, ys) index arrays.
+        """
+        edge = boundary.copy()
+        edge[[0, -1], :] = True
+        edge[:, [0, -1]] = True
+
+        ys, xs = np.nonzero(edge)
+        rids = self.puzzle.region_ids[ys, xs]
+        order = np.argsort(rids, kind="stable")
+        counts = np.bincount(rids, minlength=self.puzzle.num_regions)
+        splits = np.cumsum(counts)[:-1]
+        return list(zip(np.split(xs[order], splits), np.split(ys[order], splits)))
 
     def draw_region_highlight(self, region_id: int) -> None:
         """Draw highlight for the selected region.
@@ -93,31 +163,25 @@ class GameRenderer:
         Args:
             region_id: Region to highlight.
         """
-        self.highlight_surface.fill((0, 0, 0, 0))
-
-        if region_id < 0 or region_id >= self.puzzle.num_regions:
+        # Only the previous highlight's bounding box can hold pixels
+        if self._highlight_rect is not None:
+            self.highlight_surface.fill((0, 0, 0, 0), self._highlight_rect)
+            self._dirty_rects.append(self._highlight_rect)
+        self._highlight_region = region_id
+        self._highlight_rect = self._region_rect(region_id)
+
+        if self._highlight_rect is None:
             return
+        self._dirty_rects.append(self._highlight_rect)
 
-        # Draw pulsing highlight border
-        runs = self.puzzle.region_runs[region_id]
-        highlight_color = (*self.HIGHLIGHT_COLOR, 200)
-
-        for y, x_start, x_end in runs:
-            # Draw top and bottom edges of each run
-            for x in range(x_start, x_end):
-                # Check if this pixel is on the edge of the region
-                is_edge = False
-                if y == 0 or self.puzzle.region_ids[y - 1, x] != region_id:
-                    is_edge = True
-                if y == self.puzzle.height - 1 or self.puzzle.region_ids[y + 1, x] != region_id:
-                    is_edge = True
-                if x == x_start:
-                    is_edge = True
-                if x == x_end - 1:
-                    is_edge = True
-
-                if is_edge:
-                    self.highlight_surface.set_at((x, y), highlight_color)
+        # Draw pulsing highlight border over the region's precomputed edge
+        xs, ys = self.region_edge_coords[region_id]
+        pixels = pygame.surfarray.pixels3d(self.highlight_surface)
+        pixels[xs, ys] = self.HIGHLIGHT_COLOR
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(self.highlight_surface)
+        alpha[xs, ys] = 200
+        del alpha  # Unlock the surface
 
     def draw_filled_region(self, region_id: int) -> None:
         """Draw a filled region on the filled surface.
@@ -131,8 +195,9 @@ class GameRenderer:
         color_idx = self.puzzle.region_color[region_id]
         color = self.puzzle.palette[color_idx]
 
-        for y, x_start, x_end in self.puzzle.region_runs[region_id]:
-            pygame.draw.line(self.filled_surface, color, (x_start, y), (x_end - 1, y))
+        self._fill_region(self.filled_surface, region_id, color)
+        self._dirty_rects.append(self._region_rect(region_id))
+        self._layers_version += 1
 
     def draw_temp_fill(self, region_id: int, color_idx: int) -> None:
         """Draw a preview fill on the temp surface.
@@ -148,12 +213,54 @@ class GameRenderer:
 
         color = self.puzzle.palette[color_idx]
 
-        for y, x_start, x_end in self.puzzle.region_runs[region_id]:
-            pygame.draw.line(self.temp_fill_surface, color, (x_start, y), (x_end - 1, y))
+        self._fill_region(self.temp_fill_surface, region_id, color)
+        rect = self._region_rect(region_id)
+        self._temp_rect = rect if self._temp_rect is None else self._temp_rect.union(rect)
+        self._layers_version += 1
+
+    def _fill_region(
+        self, surface: pygame.Surface, region_id: int, color: tuple[int, int, int]
+    ) -> None:
+        """Paint every pixel of a region opaque in one masked write.
+
+        Args:
+            surface: SRCALPHA surface to paint on.
+            region_id: Region to paint.
+            color: RGB fill color.
+        """
+        min_x, min_y, max_x, max_y = self.puzzle.region_bbox[region_id]
+        # Region pixels within its bounding box (surfarray is indexed [x, y])
+        inside = (
+            self.puzzle.region_ids[min_y : max_y + 1, min_x : max_x + 1] == region_id
+        ).T
+
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[min_x : max_x + 1, min_y : max_y + 1][inside] = color
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[min_x : max_x + 1, min_y : max_y + 1][inside] = 255
+        del alpha  # Unlock the surface
 
     def clear_temp_fill(self) -> None:
         """Clear the temp fill surface."""
-        self.temp_fill_surface.fill((0, 0, 0, 0))
+        if self._temp_rect is not None:
+            self.temp_fill_surface.fill((0, 0, 0, 0), self._temp_rect)
+            self._temp_rect = None
+        self._layers_version += 1
+
+    def _region_rect(self, region_id: int) -> pygame.Rect | None:
+        """Get a region's bounding box as a Rect.
+
+        Args:
+            region_id: Region to look up.
+
+        Returns:
+            Bounding Rect in puzzle pixels, or None for an invalid region.
+        """
+        if region_id < 0 or region_id >= self.puzzle.num_regions:
+            return None
+        min_x, min_y, max_x, max_y = self.puzzle.region_bbox[region_id]
+        return pygame.Rect(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
 
     def render(
         self,
@@ -172,31 +279,6 @@ class GameRenderer:
         """
         self.screen.fill(self.BACKGROUND)
 
-        # Update highlight (don't show during fill)
-        if fill_controller is None or not fill_controller.is_active():
-            self.draw_region_highlight(selected_region)
-        else:
-            self.highlight_surface.fill((0, 0, 0, 0))
-
-        # Composite puzzle layers
-        composite = self.base_surface.copy()
-        composite.blit(self.filled_surface, (0, 0))
-
-        # Add temp fill surface with shake/fade if active
-        if fill_controller is not None and fill_controller.is_active():
-            shake_x, shake_y = fill_controller.get_reject_offset()
-            alpha = fill_controller.get_reject_alpha()
-
-            if alpha < 255:
-                # Create faded copy of temp surface
-                faded_temp = self.temp_fill_surface.copy()
-                faded_temp.set_alpha(alpha)
-                composite.blit(faded_temp, (shake_x, shake_y))
-            else:
-                composite.blit(self.temp_fill_surface, (shake_x, shake_y))
-
-        composite.blit(self.highlight_surface, (0, 0))
-
         # Get camera transform
         origin_x, origin_y, zoom = camera.get_view_transform()
 
@@ -205,9 +287,36 @@ class GameRenderer:
         scaled_h = int(self.puzzle.height * zoom)
 
         if scaled_w > 0 and scaled_h > 0:
-            scaled = pygame.transform.smoothscale(composite, (scaled_w, scaled_h))
+            fill_active = fill_controller is not None and fill_controller.is_active()
+            if fill_active:
+                # Highlight hidden; preview shakes/fades every frame
+                highlight_region = -1
+                preview = (
+                    fill_controller.get_reject_offset(),
+                    fill_controller.get_reject_alpha(),
+                )
+            else:
+                highlight_region = selected_region
+                preview = None
+
+            key = (highlight_region, self._layers_version, preview, scaled_w, scaled_h)
+            if key != self._scaled_key:
+                self._update_composite(highlight_region, preview)
+                if (scaled_w, scaled_h) == self._composite_surface.get_size():
+                    # 1:1 zoom: the composite, patched in place through its
+                    # dirty rects, is already the on-screen image
+                    self._scaled = self._composite_surface
+                else:
+                    # Any other zoom: rescale the whole composite, since a
+                    # per-rect smoothscale samples with a different phase
+                    # and leaves seams
+                    self._scaled = pygame.transform.smoothscale(
+                        self._composite_surface, (scaled_w, scaled_h)
+                    )
+                self._scaled_key = key
+
             # Blit at camera-determined position
-            self.screen.blit(scaled, (int(origin_x), int(origin_y)))
+            self.screen.blit(self._scaled, (int(origin_x), int(origin_y)))
 
         # Draw numbers inside unfilled regions
         self._draw_region_numbers(camera, selected_region)
@@ -224,6 +333,63 @@ class GameRenderer:
 
         pygame.display.flip()
 
+    def _update_composite(
+        self,
+        highlight_region: int,
+        preview: tuple[tuple[int, int], int] | None,
+    ) -> None:
+        """Bring the persistent puzzle composite up to date.
+
+        Only dirty rects are repainted from the layers: regions filled
+        since the last call, and the old and new highlight and preview
+        areas.
+
+        Args:
+            highlight_region: Region to outline, or -1 for no highlight.
+            preview: ((shake_x, shake_y), alpha) for the temp fill preview,
+                or None when no fill is active.
+        """
+        # Update highlight (don't show during fill)
+        if highlight_region != self._highlight_region:
+            self.draw_region_highlight(highlight_region)
+
+        # The preview moves with the shake, so repaint where it was and is
+        dirty = self._dirty_rects
+        if self._preview_rect is not None:
+            dirty.append(self._preview_rect)
+        self._preview_rect = None
+        if preview is not None and self._temp_rect is not None:
+            (shake_x, shake_y), alpha = preview
+            self._preview_rect = self._temp_rect.move(shake_x, shake_y)
+            dirty.append(self._preview_rect)
+
+        bounds = self._composite_surface.get_rect()
+        composite = self._composite_surface
+        for rect in dirty:
+            rect = rect.clip(bounds)
+            if not rect:
+                continue
+
+            # Composite puzzle layers
+            composite.blit(self.base_surface, rect, rect)
+            composite.blit(self.filled_surface, rect, rect)
+
+            # Add temp fill surface with shake/fade if active
+            if self._preview_rect is not None:
+                source = rect.move(-shake_x, -shake_y).clip(bounds)
+                if source:
+                    dest = source.move(shake_x, shake_y)
+                    if alpha < 255:
+                        # Create faded copy of the temp area
+                        faded_temp = self.temp_fill_surface.subsurface(source).copy()
+                        faded_temp.set_alpha(alpha)
+                        composite.blit(faded_temp, dest)
+                    else:
+                        composite.blit(self.temp_fill_surface, dest, source)
+
+            composite.blit(self.highlight_surface, rect, rect)
+        dirty.clear()
+
     def _draw_fill_progress(
         self, progress: float, camera: Camera, region_id: int
     ) -> None:
@@ -249,8 +415,6 @@ class GameRenderer:
 
         # Progress arc
         if progress > 0:
-            import math
-
             start_angle = -math.pi / 2  # Start at top
             end_angle = start_angle + progress * 2 * math.pi
             rect = pygame.Rect(
@@ -378,9 +542,7 @@ class GameRenderer:
                 pygame.draw.rect(self.screen, self.OUTLINE_COLOR, rect, 1)
 
             # Draw number
-            font = pygame.font.Font(None, 24)
-            number = self.puzzle.palette_numbers[i]
-            text = font.render(str(number), True, (0, 0, 0))
+            text = self._palette_number_surfs[i]
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
 
@@ -394,8 +556,6 @@ class GameRenderer:
         if selected_region < 0 or selected_region >= self.puzzle.num_regions:
             return
 
-        font = pygame.font.Font(None, 28)
-
         # Region info
         area = self.puzzle.region_area[selected_region]
         color_idx = self.puzzle.region_color[selected_region]
@@ -404,13 +564,11 @@ class GameRenderer:
         status = "Filled" if filled else "Empty"
 
         text = f"Region {selected_region} | Target: {target_num} | Area: {area}px | {status} | Zoom: {camera.zoom:.1f}x"
-        rendered = font.render(text, True, (200, 200, 200))
+        rendered = self._info_font.render(text, True, (200, 200, 200))
         self.screen.blit(rendered, (20, 20))
 
         # Controls hint
-        hint = "A: Fill | RStick: Navigate | DPad: Jump | LStick: Pan | Triggers: Zoom | LB/RB: Palette"
-        hint_rendered = font.render(hint, True, (150, 150, 150))
-        self.screen.blit(hint_rendered, (20, self.screen_h - 30))
+        self.screen.blit(self._hint_surf, (20, self.screen_h - 30))
 
 
 def create_puzzle_snapshot(
@@ -503,7 +661,7 @@ def show_completion_screen(
         fade_in = min(fade_in + dt * 2.0, 1.0)  # Fade in over 0.5 seconds
         celebration_time += dt
 
-        for event in pygame.event.get():
+        for event in input_handler.poll_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
@@ -646,7 +804,7 @@ def run_game(
         dt_sec = dt_ms / 1000.0
 
         # Process events
-        for event in pygame.event.get():
+        for event in input_handler.poll_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
@@ -876,7 +1034,7 @@ def show_gallery(screen: pygame.Surface, input_handler: InputHandler, gallery_di
 
     running = True
     while running:
-        for event in pygame.event.get():
+        for event in input_handler.poll_events():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
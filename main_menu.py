@@ -96,7 +96,7 @@ class MainMenu:
             dt_ms = clock.tick(60)
 
             # Process events
-            for event in pygame.event.get():
+            for event in input_handler.poll_events():
                 if event.type == pygame.QUIT:
                     return "quit"
                 elif event.type == pygame.KEYDOWN:
@@ -10,11 +10,6 @@ import random
 
 import pygame
 
-from generators import (
-    get_generator,
-    create_puzzle,
-    PRESETS,
-)
 from menu import Menu, MenuItem, MenuItemType, MenuRenderer, MenuController
 from input_handler import InputHandler, BUTTON_A, BUTTON_B, BUTTON_LB, BUTTON_RB
 from palettes import PALETTE_NAMES, get_palette
@@ -288,7 +283,7 @@ class SettingsMenu:
             dt_ms = clock.tick(60)
 
             # Process events
-            for event in pygame.event.get():
+            for event in input_handler.poll_events():
                 if event.type == pygame.QUIT:
                     return "cancel"
                 elif event.type == pygame.KEYDOWN:
@@ -353,6 +348,9 @@ class SettingsMenu:
         Returns:
             True if generation succeeded.
         """
+        # Imported here so opening the game doesn't load the generators
+        from generators import create_puzzle, get_generator
+
         try:
             kwargs = self.settings.to_generator_kwargs()
             generator = get_generator(self.settings.preset, **kwargs)